@@ -0,0 +1,51 @@
+"""
+Benchmark encoded size and encode/decode time of the available compression
+codecs over realistic API payload sizes.
+
+Usage:
+
+    $ python benchmarks/bench_codec.py
+"""
+import timeit
+
+import fake_nuke
+
+nukedatastore = fake_nuke.setup()
+
+RECORD_COUNTS = (10, 100, 1000, 10000)
+REPEAT = 5
+
+
+def payload(record_count):
+    return [{'id': i,
+             'code': 'sh{0:04d}'.format(i),
+             'sequence': 'sq{0:03d}'.format(i // 50),
+             'status': ('wip', 'review', 'final')[i % 3],
+             'frame_range': [1001, 1001 + i % 200],
+             'description': 'Shot {0} of the project'.format(i)}
+            for i in range(record_count)]
+
+
+def main():
+    stores = [('json', nukedatastore.NukeDataStore('bench_json'))]
+    for codec in sorted(nukedatastore.CODECS):
+        stores.append((codec, nukedatastore.NukeDataStore(
+            'bench_{0}'.format(codec), compression=codec,
+            compression_threshold=0)))
+    print('{0:>8} {1:>6} {2:>12} {3:>12} {4:>12}'.format(
+        'records', 'codec', 'size (kB)', 'encode (ms)', 'decode (ms)'))
+    for record_count in RECORD_COUNTS:
+        data = payload(record_count)
+        for codec, ds in stores:
+            encoded = ds._to_json(data)
+            encode_time = timeit.timeit(lambda: ds._to_json(data),
+                                        number=REPEAT) / REPEAT
+            decode_time = timeit.timeit(lambda: ds._from_json(encoded),
+                                        number=REPEAT) / REPEAT
+            print('{0:>8} {1:>6} {2:>12.1f} {3:>12.3f} {4:>12.3f}'.format(
+                record_count, codec, len(encoded) / 1024.0,
+                encode_time * 1000, decode_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
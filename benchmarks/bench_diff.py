@@ -0,0 +1,57 @@
+"""
+Benchmark the incremental diff engine against :class:`deepdiff.DeepDiff` on
+synthetic API payloads, for identical payloads and payloads with 1% of
+records changed.
+
+Usage:
+
+    $ python benchmarks/bench_diff.py
+"""
+import copy
+import timeit
+
+import deepdiff
+
+import fake_nuke
+
+nukedatastore = fake_nuke.setup()
+
+RECORD_COUNTS = (100, 1000, 10000)
+REPEAT = 3
+
+
+def payload(record_count):
+    return {'shots': [{'id': i,
+                       'code': 'sh{0:04d}'.format(i),
+                       'status': ('wip', 'review', 'final')[i % 3],
+                       'frame_range': [1001, 1001 + i % 200],
+                       'tags': ['tag{0}'.format(i % 7)]}
+                      for i in range(record_count)]}
+
+
+def changed(data):
+    data = copy.deepcopy(data)
+    for record in data['shots'][::100]:
+        record['status'] = 'omit'
+    return data
+
+
+def main():
+    print('{0:>8} {1:>10} {2:>15} {3:>12}'.format(
+        'records', 'payload', 'deepdiff (ms)', 'engine (ms)'))
+    for record_count in RECORD_COUNTS:
+        old = payload(record_count)
+        for name, new in (('identical', copy.deepcopy(old)),
+                          ('changed', changed(old))):
+            assert (nukedatastore._diff(old, new) ==
+                    dict(deepdiff.DeepDiff(old, new)))
+            deepdiff_time = timeit.timeit(
+                lambda: deepdiff.DeepDiff(old, new), number=REPEAT) / REPEAT
+            engine_time = timeit.timeit(
+                lambda: nukedatastore._diff(old, new), number=REPEAT) / REPEAT
+            print('{0:>8} {1:>10} {2:>15.3f} {3:>12.3f}'.format(
+                record_count, name, deepdiff_time * 1000, engine_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark :class:`~nukedatastore.NukeDataStore` construction time against the
+number of nodes in the script, comparing the data store registry with a full
+script scan.
+
+Usage:
+
+    $ python benchmarks/bench_init.py
+"""
+import timeit
+
+import fake_nuke
+
+nukedatastore = fake_nuke.setup()
+
+NODE_COUNTS = (100, 1000, 5000, 10000)
+REPEAT = 50
+
+
+def setup_script(node_count):
+    fake_nuke.scriptClear()
+    for i in range(node_count):
+        fake_nuke.nodes.NoOp(name='node{0}'.format(i))
+    nukedatastore.NukeDataStore('data_store')
+
+
+def scan():
+    nukedatastore._clear_registry()
+    nukedatastore.NukeDataStore('data_store')
+
+
+def registry():
+    nukedatastore.NukeDataStore('data_store')
+
+
+def main():
+    print('{0:>8} {1:>12} {2:>14}'.format('nodes', 'scan (ms)',
+                                          'registry (ms)'))
+    for node_count in NODE_COUNTS:
+        setup_script(node_count)
+        scan_time = timeit.timeit(scan, number=REPEAT) / REPEAT
+        registry_time = timeit.timeit(registry, number=REPEAT) / REPEAT
+        print('{0:>8} {1:>12.3f} {2:>14.3f}'.format(
+            node_count, scan_time * 1000, registry_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
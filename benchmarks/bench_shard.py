@@ -0,0 +1,68 @@
+"""
+Benchmark write and read time of sharded and unsharded values as payload
+size grows, and the number of bytes set on knobs when a large value is
+overwritten with a small change.
+
+Usage:
+
+    $ python benchmarks/bench_shard.py
+"""
+import copy
+import timeit
+
+import fake_nuke
+
+nukedatastore = fake_nuke.setup()
+
+RECORD_COUNTS = (1000, 10000, 50000)
+SHARD_SIZE = 65536
+REPEAT = 3
+
+_written = [0]
+_set_value = fake_nuke.Knob.setValue
+
+
+def _counting_set_value(knob, value):
+    _written[0] += len(str(value))
+    _set_value(knob, value)
+
+
+fake_nuke.Knob.setValue = _counting_set_value
+
+
+def payload(record_count):
+    return [{'id': i,
+             'code': 'sh{0:05d}'.format(i),
+             'status': ('wip', 'review', 'final')[i % 3],
+             'frame_range': [1001, 1001 + i % 200]}
+            for i in range(record_count)]
+
+
+def main():
+    print('{0:>8} {1:>10} {2:>11} {3:>11} {4:>10} {5:>16}'.format(
+        'records', 'mode', 'size (kB)', 'write (ms)', 'read (ms)',
+        'rewrite (kB)'))
+    for record_count in RECORD_COUNTS:
+        data = payload(record_count)
+        changed = copy.deepcopy(data)
+        changed[-1]['status'] = 'omit'
+        for mode, shard_size in (('single', None), ('sharded', SHARD_SIZE)):
+            ds = nukedatastore.NukeDataStore(
+                'bench_{0}'.format(mode), cache=False, shard_size=shard_size)
+            write_time = timeit.timeit(lambda: ds.__setitem__('data', data),
+                                       number=REPEAT) / REPEAT
+            read_time = timeit.timeit(lambda: ds['data'],
+                                      number=REPEAT) / REPEAT
+            _written[0] = 0
+            ds['data'] = changed
+            rewritten = _written[0]
+            ds['data'] = data
+            print('{0:>8} {1:>10} {2:>11.1f} {3:>11.3f} {4:>10.3f} '
+                  '{5:>16.1f}'.format(
+                      record_count, mode, len(ds._to_json(data)) / 1024.0,
+                      write_time * 1000, read_time * 1000,
+                      rewritten / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Minimal in-memory stand-in for the ``nuke`` module, sufficient to run
+``nukedatastore`` outside of Nuke for benchmarking.
+"""
+STARTLINE = 1
+
+_nodes = []
+_callbacks = {'onCreate': [], 'onDestroy': [], 'onScriptLoad': [],
+              'onScriptClose': [], 'knobChanged': []}
+_this = []
+_groups = []
+
+
+class Knob(object):
+    def __init__(self, name, label=None, value=''):
+        self._name = name
+        self._value = value
+        self._node = None
+
+    def name(self):
+        return self._name
+
+    def value(self):
+        return self._value
+
+    def setValue(self, value):
+        self._value = value
+        if self._node is not None:
+            _fire('knobChanged', self._node, self)
+
+    def setEnabled(self, enabled):
+        pass
+
+    def setVisible(self, visible):
+        pass
+
+    def setFlag(self, flag):
+        pass
+
+    def setCommand(self, command):
+        self._value = command
+
+
+class Text_Knob(Knob):
+    pass
+
+
+class Tab_Knob(Knob):
+    pass
+
+
+class PyScript_Knob(Knob):
+    pass
+
+
+class Node(object):
+    def __init__(self, class_, name):
+        self._class = class_
+        self._deleted = False
+        self._parent = None
+        self._knobs = {}
+        for attr in ('name', 'label', 'hide_input', 'tile_color'):
+            self.addKnob(Knob(attr))
+        self._knobs['name']._value = name
+
+    def _check(self):
+        if self._deleted:
+            raise ValueError('A PythonObject is not attached to a node')
+
+    def __bool__(self):
+        self._check()
+        return True
+    __nonzero__ = __bool__
+
+    def name(self):
+        self._check()
+        return self._knobs['name'].value()
+
+    def fullName(self):
+        if self._parent is None:
+            return self.name()
+        return '{0}.{1}'.format(self._parent.fullName(), self.name())
+
+    def Class(self):
+        return self._class
+
+    def knobs(self):
+        self._check()
+        return dict(self._knobs)
+
+    def __getitem__(self, attr):
+        self._check()
+        try:
+            return self._knobs[attr]
+        except KeyError:
+            raise NameError(attr)
+
+    def addKnob(self, knob):
+        self._check()
+        knob._node = self
+        self._knobs[knob.name()] = knob
+
+    def removeKnob(self, knob):
+        self._check()
+        del self._knobs[knob.name()]
+
+
+class Group(Node):
+    def __init__(self, name):
+        super(Group, self).__init__('Group', name)
+        self._children = []
+
+    def nodes(self):
+        return list(self._children)
+
+    def begin(self):
+        _groups.append(self)
+
+    def end(self):
+        _groups.remove(self)
+
+
+class _Root(object):
+    def nodes(self):
+        return list(_nodes)
+
+
+_root = _Root()
+
+
+class _Nodes(object):
+    def _create(self, node, parent=None):
+        if parent is None and _groups:
+            parent = _groups[-1]
+        if parent is None:
+            _nodes.append(node)
+        else:
+            node._parent = parent
+            parent._children.append(node)
+        _fire('onCreate', node)
+        return node
+
+    def NoOp(self, name=None, parent=None, **kwargs):
+        name = name or 'NoOp{0}'.format(len(_nodes) + 1)
+        return self._create(Node('NoOp', name), parent)
+
+    def Group(self, name=None, parent=None, **kwargs):
+        name = name or 'Group{0}'.format(len(_nodes) + 1)
+        return self._create(Group(name), parent)
+
+
+nodes = _Nodes()
+
+
+def _fire(kind, node, knob=None):
+    _this.append((node, knob))
+    try:
+        for func, args, kwargs, node_class in list(_callbacks[kind]):
+            if node_class in (None, '*', node.Class()):
+                func(*args, **kwargs)
+    finally:
+        _this.pop()
+
+
+def _add_callback(kind):
+    def add(func, args=(), kwargs={}, nodeClass='*'):
+        _callbacks[kind].append((func, args, kwargs, nodeClass))
+    return add
+
+
+addOnCreate = _add_callback('onCreate')
+addOnDestroy = _add_callback('onDestroy')
+addOnScriptLoad = _add_callback('onScriptLoad')
+addOnScriptClose = _add_callback('onScriptClose')
+addKnobChanged = _add_callback('knobChanged')
+
+
+def thisNode():
+    return _this[-1][0]
+
+
+def thisKnob():
+    return _this[-1][1]
+
+
+def allNodes(filter=None, group=None, recurseGroups=False):
+    if group is None:
+        group = _groups[-1] if _groups else _root
+    result = []
+    for node in group.nodes():
+        result.append(node)
+        if recurseGroups and isinstance(node, Group):
+            result.extend(allNodes(group=node, recurseGroups=True))
+    return result
+
+
+def root():
+    return _root
+
+
+def toNode(name):
+    for node in _nodes:
+        if node.name() == name:
+            return node
+
+
+def delete(node):
+    _fire('onDestroy', node)
+    if node._parent is None:
+        _nodes.remove(node)
+    else:
+        node._parent._children.remove(node)
+    node._deleted = True
+
+
+def scriptClear():
+    for node in allNodes(recurseGroups=True):
+        node._deleted = True
+    del _nodes[:]
+    del _groups[:]
+    for kind in ('onScriptClose', 'onScriptLoad'):
+        for func, args, kwargs, _ in list(_callbacks[kind]):
+            func(*args, **kwargs)
+
+
+class Undo(object):
+    def __init__(self, name=None):
+        self.name = name
+
+    def begin(self, name=None):
+        pass
+
+    def end(self):
+        pass
+
+    def cancel(self):
+        pass
+
+
+def executeInMainThread(func, args=(), kwargs={}):
+    func(*args, **kwargs)
+
+
+def executeInMainThreadWithResult(func, args=(), kwargs={}):
+    return func(*args, **kwargs)
+
+
+def ask(message):
+    return True
+
+
+def setup():
+    """
+    Install this module as ``nuke`` and return the imported
+    ``nukedatastore`` package.
+    """
+    import os
+    import sys
+    os.environ['NON_PRODUCTION_CONTEXT'] = '1'
+    sys.modules['nuke'] = sys.modules[__name__]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    import nukeuuid
+    # nukeuuid only binds nuke inside Nuke
+    nukeuuid.nuke = sys.modules[__name__]
+    import nukedatastore
+    return nukedatastore
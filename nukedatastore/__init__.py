@@ -1,12 +1,69 @@
 import os
 import re
 import sys
+import mmap
+import time
+import zlib
 import json
+import hashlib
+import base64
+import decimal
+import bisect
+import weakref
+import threading
 import datetime
+import functools
+import contextlib
 import platform
+import tempfile
+
+from multiprocessing.pool import ThreadPool
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
 
 import deepdiff
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from urllib3.exceptions import HTTPError
+    from urllib3.util.retry import Retry
+except ImportError:
+    from requests.packages.urllib3.exceptions import HTTPError
+    from requests.packages.urllib3.util.retry import Retry
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 
 from nukeuuid import get_nodes, set_uuid, NukeUUIDError
 
@@ -35,41 +92,1311 @@ except:
     if not match:
         raise RuntimeError('Import nukedatastore from within Nuke')
     nuke = import_nuke()
+else:
+    nuke = import_nuke()
 
 __version__ = '0.2.0'
 __all__ = []
 
+STORE_UUID = '356455a5-3e58-47b7-8d37-3bb37610187b'
+UUID_ATTR = 'uuid'
 DS_PREFIX = 'ds_'
+NDS_PREFIX = 'nds_'
 FROZEN_ATTR = 'nds_frozen'
+INDEX_ATTR = 'nds_index'
+META_PREFIX = 'nds_meta_'
+SHARD_PREFIX = 'nds_shard_'
+MANIFEST_PREFIX = '#shards:'
+CODEC_PREFIX = '@'
+COMPRESSION_THRESHOLD = 16384
+SHARD_SIZE = 1048576
+MAX_WORKERS = 8
+ASYNC_WORKERS = 16
+POOL_SIZE = MAX_WORKERS
+RETRIES = 3
+BACKOFF = 0.5
+TIMEOUT = (3.05, 30)
+COALESCE_WINDOW = 1.0
+DISK_CACHE_SIZE = 1073741824
+DISK_CACHE_ENV = 'NUKEDATASTORE_DISK_CACHE'
+CODECS = {'zlib': (zlib.compress, zlib.decompress)}
+if lzma:
+    CODECS['lzma'] = (lzma.compress, lzma.decompress)
+SERIALIZER_ATTR = 'nds_serializer'
+SERIALIZERS = {
+    'json': (json.dumps, json.loads),
+    'compact': (functools.partial(json.dumps, separators=(',', ':')),
+                json.loads)
+}
+# ujson before 2.0 rounds floats to 9 digits and drops small floats
+_FLOATS = [0.1234567890123456, 1e-12, 1e-300]
+if ujson and ujson.loads(ujson.dumps(_FLOATS)) == _FLOATS:
+    SERIALIZERS['ujson'] = (ujson.dumps, ujson.loads)
+if orjson:
+    SERIALIZERS['orjson'] = (lambda value: orjson.dumps(value).decode('utf-8'),
+                             orjson.loads)
+REFRESH_PROMPT = ('API {api} has the following changes on the server:\n\n'
+                  '{diff}\n\nUpdate {api}?')
 UPDATE_CMD = r"""import nukedatastore
 
-api_cache = nukedatastore.NukeAPICache(nuke.thisNode().name())
+api_cache = nukedatastore.NukeAPICache(nuke.thisNode().name())
+api_cache.refresh(interactive=True)"""
+
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
+
+_MISSING = object()
+
+
+class NukeDataStoreError(ValueError):
+    """
+    Exception indicating an error related to the Nuke Data Store,
+    inherits from :class:`ValueError`.
+    """
+    def __init__(self, message):
+        super(NukeDataStoreError, self).__init__(message)
+
+
+def _parse_timestamp(timestamp):
+    """
+    Given an ISO 8601 ``timestamp`` as written by
+    :class:`~nukedatastore.NukeAPICache`, return a datetime.
+
+    :param timestamp: ISO 8601 timestamp
+    :type timestamp: str
+    :rtype: :class:`datetime.datetime`
+    """
+    try:
+        return datetime.datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%f')
+    except ValueError:
+        return datetime.datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S')
+
+
+def _copy(value):
+    """
+    Given a decoded ``value``, return a deep copy of its lists and dicts.
+    Faster than :func:`copy.deepcopy` for JSON data.
+
+    :param value: Decoded value
+    :return: Copied value
+    """
+    if isinstance(value, dict):
+        return dict((key, _copy(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _canonical(value):
+    """
+    Given a ``value``, return its canonical JSON encoding, with sorted keys
+    and without whitespace.
+
+    :param value: Decoded value
+    :return: Canonical JSON-encoded value
+    :rtype: str
+    """
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+class _Encoded(object):
+    """
+    A value that is already JSON-encoded and is written as is, see
+    :meth:`NukeDataStore._to_json`.
+    """
+    def __init__(self, json):
+        self.json = json
+
+
+def _digest(value):
+    """
+    Given a ``value``, return the SHA-1 digest of its canonical JSON encoding.
+
+    :param value: Decoded value
+    :return: Hex digest
+    :rtype: str
+    """
+    return hashlib.sha1(_canonical(value).encode('utf-8')).hexdigest()
+
+
+def _normalize_field(field):
+    """
+    Given a ``field`` in dotted or simple JSONPath notation, e.g.
+    ``$[*].status.code``, return its dotted name, e.g. ``status.code``.
+    Fields are relative to each record of list responses.
+
+    :param field: Field name
+    :type field: str
+    :return: Dotted field name
+    :rtype: str
+    """
+    field = re.sub(r'\[\*\]', '', field)
+    field = re.sub(r"\[['\"]?([^'\"\]]+)['\"]?\]", r'.\1', field)
+    return field.lstrip('$').lstrip('.')
+
+
+def _get_spec(meta):
+    """
+    Given an API's ``meta``, return its projection spec, or ``None`` if the
+    API stores all data.
+
+    :param meta: API metadata
+    :type meta: dict
+    :return: Spec with ``fields`` and ``where``
+    :rtype: dict
+    """
+    if not meta.get('fields') and not meta.get('where'):
+        return None
+    return {'fields': meta.get('fields'), 'where': meta.get('where')}
+
+
+def _get_path(record, field):
+    """
+    Given a ``record`` and a dotted ``field``, return the field's value or
+    ``_MISSING``.
+    """
+    for part in field.split('.'):
+        if not isinstance(record, dict) or part not in record:
+            return _MISSING
+        record = record[part]
+    return record
+
+
+def _matches(record, where):
+    """
+    Given a ``record`` and a ``where`` filter, return whether the record
+    matches. Filters map dotted fields to a value or a list of values.
+
+    :param record: Record
+    :param where: Filter
+    :type where: dict
+    :rtype: bool
+    """
+    for field, expected in where.items():
+        value = _get_path(record, field)
+        if isinstance(expected, list):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+def _shape(data, spec):
+    """
+    Given ``data`` and a projection ``spec``, filter the records of list
+    data and project the data to the spec's fields.
+
+    :param data: Decoded value
+    :param spec: Spec, see :func:`_get_spec`
+    :type spec: dict
+    :return: Shaped value
+    """
+    if spec is None:
+        return data
+    tree = _get_field_tree(spec['fields'])
+    if isinstance(data, list) and spec['where']:
+        return [_project(record, tree) for record in data
+                if _matches(record, spec['where'])]
+    return _project(data, tree)
+
+
+def _get_field_tree(fields):
+    """
+    Given a list of dotted ``fields``, return them as a tree of nested
+    dicts, ``None`` marks fields that are kept as a whole.
+
+    :param fields: Dotted field names, e.g. ``['id', 'shot.name']``
+    :type fields: list
+    :return: Field tree
+    :rtype: dict
+    """
+    if not fields:
+        return None
+    tree = {}
+    for field in fields:
+        node = tree
+        parts = field.split('.')
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def _project(data, tree):
+    """
+    Given ``data`` and a field ``tree``, return ``data`` reduced to the
+    fields in ``tree``. Lists are projected item by item.
+
+    :param data: Decoded value
+    :param tree: Field tree, see :func:`_get_field_tree`
+    :type tree: dict
+    :return: Projected value
+    """
+    if tree is None:
+        return data
+    if isinstance(data, list):
+        return [_project(item, tree) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return dict((key, _project(data[key], sub_tree))
+                for key, sub_tree in tree.items() if key in data)
+
+
+def _to_float(value):
+    """
+    Given a ``value`` decoded by ``ijson``, convert its decimals to floats.
+
+    :param value: Decoded value
+    :return: Decoded value
+    """
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, list):
+        return [_to_float(item) for item in value]
+    if isinstance(value, dict):
+        return dict((key, _to_float(item)) for key, item in value.items())
+    return value
+
+
+def _iter_json(stream, prefix):
+    """
+    Given a ``stream`` and a ``prefix``, incrementally decode the JSON
+    values at ``prefix`` with ``ijson``.
+
+    :param stream: Binary file-like object
+    :param prefix: ``ijson`` prefix
+    :type prefix: str
+    :return: Decoded values
+    :rtype: iterator
+    """
+    version = tuple(int(part) for part in re.findall(r'\d+',
+                                                     ijson.__version__)[:2])
+    if version >= (3, 1):
+        return ijson.items(stream, prefix, use_float=True)
+    return (_to_float(item) for item in ijson.items(stream, prefix))
+
+
+class _PeekedStream(object):
+    """
+    File-like object that returns the already read ``head`` of ``stream``
+    before the rest of ``stream``.
+    """
+    def __init__(self, head, stream):
+        self.head = head
+        self.stream = stream
+
+    def read(self, size=-1):
+        head, self.head = self.head, b''
+        if size is None or size < 0:
+            return head + self.stream.read()
+        if len(head) >= size:
+            self.head = head[size:]
+            return head[:size]
+        return head + self.stream.read(size - len(head))
+
+
+def _load_stream(stream, spec=None):
+    """
+    Given a binary ``stream`` of JSON, decode it incrementally and shape it
+    with ``spec``. Arrays are decoded, filtered and projected record by
+    record with ``ijson``, so unprojected records are never held in memory
+    at once. Without ``ijson``, the whole response is read into memory and
+    decoded at once.
+
+    :param stream: Binary file-like object
+    :param spec: Spec, see :func:`_get_spec`, default: ``None``
+    :type spec: dict
+    :return: Decoded value
+    """
+    head = stream.read(1)
+    while head and head.isspace():
+        head = stream.read(1)
+    stream = _PeekedStream(head, stream)
+    if ijson is None:
+        return _shape(json.load(stream), spec)
+    try:
+        if head == b'[':
+            records = _iter_json(stream, 'item')
+            if spec is None:
+                return list(records)
+            tree = _get_field_tree(spec['fields'])
+            return [_project(record, tree) for record in records
+                    if not spec['where'] or _matches(record, spec['where'])]
+        for value in _iter_json(stream, ''):
+            return _shape(value, spec)
+    except ijson.JSONError as e:
+        raise ValueError(str(e))
+    raise ValueError('No JSON object could be decoded')
+
+
+def _identical(old, new):
+    """
+    Given ``old`` and ``new`` data, return whether they are identical,
+    including the types of their values. Compare the data natively first and
+    only fall back to comparing encodings for data that compares equal.
+
+    :param old: Old data
+    :param new: New data
+    :rtype: bool
+    """
+    if old != new:
+        return False
+    return (json.dumps(old) == json.dumps(new) or
+            _canonical(old) == _canonical(new))
+
+
+def _format_path(path, key):
+    """
+    Given a DeepDiff ``path`` and a ``key``, return the path of the item.
+
+    :param path: DeepDiff path, i.e. ``root``
+    :type path: str
+    :param key: Dictionary key or list index
+    :return: DeepDiff path of the item
+    :rtype: str
+    """
+    if isinstance(key, string_types):
+        return "{0}['{1}']".format(path, key)
+    return '{0}[{1}]'.format(path, key)
+
+
+def _index_records(value):
+    """
+    Given a ``value``, index it by record ``id`` if it is a list of records
+    with unique ids, otherwise return ``None``.
+
+    :param value: Decoded value
+    :return: Records and their indices by record id
+    :rtype: dict
+    """
+    if not isinstance(value, list):
+        return None
+    index = {}
+    for i, record in enumerate(value):
+        try:
+            record_id = record['id']
+            if record_id in index:
+                return None
+            index[record_id] = (i, record)
+        except (KeyError, TypeError):
+            return None
+    return index
+
+
+def _merge_diff(diff, sub_diff, path='root'):
+    """
+    Given a ``diff``, merge the DeepDiff ``sub_diff`` of the item at ``path``
+    into it.
+
+    :param diff: Diff
+    :type diff: dict
+    :param sub_diff: DeepDiff of an item, rooted at ``root``
+    :type sub_diff: dict
+    :param path: DeepDiff path of the item, default: ``root``
+    :type path: str
+    """
+    for report_type, report in sub_diff.items():
+        if isinstance(report, dict):
+            merged = diff.setdefault(report_type, {})
+            for item_path, change in report.items():
+                merged[path + item_path[len('root'):]] = change
+        else:
+            merged = diff.setdefault(report_type, set())
+            for item_path in report:
+                merged.add(path + item_path[len('root'):])
+
+
+def _diff(old, new, path='root'):
+    """
+    Given ``old`` and ``new`` data, return a diff in the format of
+    :class:`deepdiff.DeepDiff`. Identical data is detected without
+    diff'ing. Dictionaries are diff'ed key by key and lists
+    of records with unique ``id`` keys are matched by id, so only changed
+    items are passed to :class:`deepdiff.DeepDiff`. Lists whose shared
+    records changed order, and other lists, are diff'ed as a whole.
+
+    :param old: Old data
+    :param new: New data
+    :param path: DeepDiff path of the data, default: ``root``
+    :type path: str
+    :return: Diff
+    :rtype: dict
+    """
+    if _identical(old, new):
+        return {}
+    diff = {}
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                diff.setdefault('dictionary_item_removed', set()).add(
+                    _format_path(path, key))
+        for key in new:
+            if key not in old:
+                diff.setdefault('dictionary_item_added', set()).add(
+                    _format_path(path, key))
+            else:
+                _merge_diff(diff, _diff(old[key], new[key],
+                                        _format_path(path, key)))
+        return diff
+    old_index = _index_records(old)
+    new_index = _index_records(new)
+    if old_index is None or new_index is None or \
+            [record['id'] for record in old if record['id'] in new_index] != \
+            [record['id'] for record in new if record['id'] in old_index]:
+        _merge_diff(diff, deepdiff.DeepDiff(old, new), path)
+        return diff
+    for record_id, (i, record) in old_index.items():
+        if record_id not in new_index:
+            diff.setdefault('iterable_item_removed', {})[
+                _format_path(path, i)] = record
+    for record_id, (i, record) in new_index.items():
+        if record_id not in old_index:
+            diff.setdefault('iterable_item_added', {})[
+                _format_path(path, i)] = record
+        else:
+            _merge_diff(diff, _diff(old_index[record_id][1], record,
+                                    _format_path(path, i)))
+    return diff
+
+
+def create_session(pool_size=POOL_SIZE, retries=RETRIES, backoff=BACKOFF):
+    """
+    Create a :class:`requests.Session` with a pool of keep-alive connections
+    per host and retries with exponential backoff on connection errors and
+    transient server errors.
+
+    :param pool_size: Maximum number of connections per host, default:
+                      ``POOL_SIZE``
+    :type pool_size: int
+    :param retries: Maximum number of retries, default: ``RETRIES``
+    :type retries: int
+    :param backoff: Backoff factor in seconds, default: ``BACKOFF``
+    :type backoff: float
+    :return: Session
+    :rtype: :class:`requests.Session`
+    """
+    retry = Retry(total=retries, backoff_factor=backoff,
+                  status_forcelist=(500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session():
+    """
+    Return the session shared by all :class:`~nukedatastore.NukeAPICache`
+    instances, create it on first use.
+
+    :return: Session
+    :rtype: :class:`requests.Session`
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = create_session()
+        return _SESSION
+
+
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def _get_engine():
+    """
+    Return the thread pool shared by all asynchronous
+    :class:`~nukedatastore.NukeAPICache` requests, create it on first use.
+    The pool runs up to ``ASYNC_WORKERS`` requests at a time, independent of
+    the pools used by blocking requests.
+
+    :return: Thread pool
+    :rtype: :class:`multiprocessing.pool.ThreadPool`
+    """
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = ThreadPool(ASYNC_WORKERS)
+        return _ENGINE
+
+
+class _Flight(object):
+    """
+    A request shared by all callers requesting the same URL with the same
+    headers, see :func:`_coalesce`.
+    """
+    def __init__(self):
+        self.event = threading.Event()
+        self.expires = None
+        self.result = None
+        self.error = None
+
+
+_FLIGHTS = {}
+_FLIGHTS_LOCK = threading.Lock()
+
+
+def _expire_flight(key, flight):
+    """
+    Given a request ``key`` and its finished ``flight``, stop sharing the
+    flight's result, see :func:`_coalesce`.
+    """
+    with _FLIGHTS_LOCK:
+        if _FLIGHTS.get(key) is flight:
+            del _FLIGHTS[key]
+
+
+def _coalesce(key, func):
+    """
+    Given a request ``key`` and a ``func`` performing the request, call
+    ``func`` once for all concurrent callers with the same ``key`` and share
+    its result. ``func`` returns a result and a private value, only the
+    caller that performed the request receives the private value, other
+    callers receive ``None``. Successful results are shared with callers for
+    another ``COALESCE_WINDOW`` seconds and dropped once the window expires,
+    errors are only shared with concurrent callers.
+
+    :param key: Request key
+    :type key: tuple
+    :param func: Request function
+    :type func: callable
+    :return: Result of ``func`` and the private value
+    :rtype: tuple
+    """
+    now = time.time()
+    with _FLIGHTS_LOCK:
+        flight = _FLIGHTS.get(key)
+        leader = flight is None or (flight.expires is not None and
+                                    flight.expires <= now)
+        if leader:
+            for expired in [k for k, f in _FLIGHTS.items()
+                            if f.expires is not None and f.expires <= now]:
+                del _FLIGHTS[expired]
+            flight = _FLIGHTS[key] = _Flight()
+    private = None
+    if leader:
+        try:
+            flight.result, private = func()
+        except Exception as e:
+            flight.error = e
+        if flight.error is not None or COALESCE_WINDOW <= 0:
+            _expire_flight(key, flight)
+        else:
+            with _FLIGHTS_LOCK:
+                flight.expires = time.time() + COALESCE_WINDOW
+            timer = threading.Timer(COALESCE_WINDOW, _expire_flight,
+                                    (key, flight))
+            timer.daemon = True
+            timer.start()
+        flight.event.set()
+    else:
+        flight.event.wait()
+    if flight.error is not None:
+        raise flight.error
+    return flight.result, private
+
+
+def _lock_file(f):
+    """
+    Given an open file ``f``, block until an exclusive lock on the file is
+    acquired. Locks are advisory and shared across processes.
+
+    :param f: Open file
+    :type f: file
+    """
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    elif msvcrt:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(f):
+    """
+    Given an open file ``f``, release the lock acquired with
+    :func:`_lock_file`.
+
+    :param f: Open file
+    :type f: file
+    """
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    elif msvcrt:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _replace(src, dst):
+    """
+    Given a ``src`` and a ``dst`` path, move ``src`` to ``dst``, replacing
+    ``dst`` if it exists.
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        os.remove(dst)
+        os.rename(src, dst)
+
+
+_NOT_MODIFIED = object()
+_INSTANCES = weakref.WeakSet()
+_REGISTRY = {}
+_CATALOG = None
+_CALLBACKS_INSTALLED = False
+
+
+def _install_callbacks():
+    """
+    Install the Nuke callbacks that keep
+    :class:`~nukedatastore.NukeDataStore` instances in sync with their nodes.
+    The callbacks are only installed once per session.
+    """
+    global _CALLBACKS_INSTALLED
+    if _CALLBACKS_INSTALLED:
+        return
+    nuke.addKnobChanged(_on_knob_changed, nodeClass='NoOp')
+    nuke.addOnScriptLoad(_build_registry)
+    nuke.addOnScriptClose(_clear_registry)
+    nuke.addOnCreate(_on_create, nodeClass='NoOp')
+    nuke.addOnDestroy(_on_destroy, nodeClass='NoOp')
+    _CALLBACKS_INSTALLED = True
+
+
+def _is_store(node):
+    """
+    Given a ``node``, return whether it is a data store node.
+
+    :param node: Nuke node
+    :type node: :class:`~nuke.Node`
+    :rtype: bool
+    """
+    try:
+        return node[UUID_ATTR].value() == STORE_UUID
+    except NameError:
+        return False
+
+
+def _build_registry():
+    """
+    Scan the script for data store nodes and rebuild the data store registry,
+    mapping data store names to nodes.
+    """
+    _clear_catalog()
+    _REGISTRY.clear()
+    try:
+        nodes = get_nodes(**{'': STORE_UUID})
+    except NukeUUIDError:
+        nodes = []
+    for node in nodes:
+        _REGISTRY[node.name()] = node
+
+
+def _clear_registry():
+    """
+    Clear the data store registry.
+    """
+    _clear_catalog()
+    _REGISTRY.clear()
+
+
+def _register_store(node):
+    """
+    Given a data store ``node``, add it to the data store registry.
+
+    :param node: Data store node
+    :type node: :class:`~nuke.Node`
+    """
+    _REGISTRY[node.name()] = node
+
+
+def _find_store(name):
+    """
+    Given a ``name``, return the data store node of the same name or
+    ``None``. Look up the data store registry first and only scan the script
+    on a registry miss.
+
+    :param name: Data store name
+    :type name: str
+    :return: Data store node
+    :rtype: :class:`~nuke.Node`
+    """
+    node = _REGISTRY.get(name)
+    try:
+        if node is not None and node.name() == name and _is_store(node):
+            return node
+    except ValueError:
+        pass
+    _build_registry()
+    return _REGISTRY.get(name)
+
+
+def _on_create():
+    """
+    onCreate callback, register created or pasted data store nodes.
+    """
+    node = nuke.thisNode()
+    if _is_store(node):
+        _clear_catalog()
+        _register_store(node)
+
+
+def _on_destroy():
+    """
+    onDestroy callback, unregister deleted data store nodes.
+    """
+    node = nuke.thisNode()
+    if _is_store(node):
+        _clear_catalog()
+        _REGISTRY.pop(node.name(), None)
+
+
+def _clear_catalog():
+    """
+    Clear the cached data store catalog.
+    """
+    global _CATALOG
+    _CATALOG = None
+
+
+def _describe_store(node):
+    """
+    Given a data store ``node``, return its catalog entry. Only the node's
+    raw knob values are inspected, no data is decoded.
+
+    :param node: Data store node
+    :type node: :class:`~nuke.Node`
+    :return: Catalog entry
+    :rtype: dict
+    """
+    keys = 0
+    size = 0
+    knobs = node.knobs()
+    for attr, knob in knobs.items():
+        if not attr.startswith((DS_PREFIX, NDS_PREFIX)):
+            continue
+        if attr.startswith(DS_PREFIX):
+            keys += 1
+        size += len(knob.value())
+    frozen = FROZEN_ATTR in knobs and knobs[FROZEN_ATTR].value() == 'true'
+    return {'name': node.fullName(),
+            'type': 'api_cache' if 'update' in knobs else 'data_store',
+            'keys': keys,
+            'size': size,
+            'frozen': frozen}
+
+
+def stores(refresh=False):
+    """
+    Return a catalog of all data stores in the script, including data stores
+    inside groups. The script is scanned once and the catalog is cached until
+    a data store is created, deleted or modified.
+
+    Usage:
+
+    >>> import nukedatastore
+    >>> nukedatastore.stores()
+    [{'name': 'data_store', 'type': 'data_store', 'keys': 1, 'size': 42,
+      'frozen': False}]
+
+    :param refresh: Rescan the script, default: ``False``
+    :type refresh: bool
+    :return: Catalog entries with name, type (``data_store`` or
+             ``api_cache``), number of keys, size of all knob values in
+             bytes and frozen state
+    :rtype: list
+    """
+    global _CATALOG
+    if _CATALOG is None or refresh:
+        _CATALOG = [_describe_store(node)
+                    for node in nuke.allNodes(group=nuke.root(),
+                                              recurseGroups=True)
+                    if _is_store(node)]
+    return [dict(entry) for entry in _CATALOG]
+
+
+def _on_knob_changed():
+    """
+    knobChanged callback, invalidate cached data of the changed knob.
+    """
+    _invalidate(nuke.thisNode(), nuke.thisKnob().name())
+
+
+def _invalidate(node, attr):
+    """
+    Given a ``node`` and an ``attr``, invalidate cached data for ``attr`` on
+    all :class:`~nukedatastore.NukeDataStore` instances wrapping ``node``.
+
+    :param node: Data store node
+    :type node: :class:`~nuke.Node`
+    :param attr: Attribute name
+    :type attr: str
+    """
+    if not attr.startswith((DS_PREFIX, NDS_PREFIX)):
+        return
+    _clear_catalog()
+    if attr.startswith(SHARD_PREFIX):
+        attr = attr[len(SHARD_PREFIX):].rsplit('_', 1)[0]
+    name = node.name()
+    for instance in list(_INSTANCES):
+        try:
+            if instance._store.name() == name:
+                instance._invalidate(attr)
+        except (AttributeError, ValueError):
+            continue
+
+
+class NukeAPIResult(dict):
+    """
+    Result of a :class:`~nukedatastore.NukeAPICache` operation on multiple
+    APIs, inherits from :class:`dict`. Maps API names to results, APIs that
+    failed are collected in ``errors``, mapping API names to error messages.
+    """
+    def __init__(self, *args, **kwargs):
+        super(NukeAPIResult, self).__init__(*args, **kwargs)
+        self.errors = {}
+
+    def raise_errors(self, message):
+        """
+        Given a ``message`` format string, raise
+        :class:`~nukedatastore.NukeDataStoreError` if any API failed. The
+        error's ``result`` attribute holds this result.
+
+        :param message: Error message, formatted with the failed API names
+        :type message: str
+        """
+        if self.errors:
+            error = NukeDataStoreError(message.format(
+                ', '.join(sorted(self.errors))))
+            error.result = self
+            raise error
+
+
+class NukeAPIFuture(object):
+    """
+    Result of an asynchronous :class:`~nukedatastore.NukeAPICache`
+    operation. The future completes on Nuke's main thread, after the
+    operation's knob writes. Callbacks added with
+    :meth:`~nukedatastore.NukeAPIFuture.add_done_callback` run on Nuke's
+    main thread, too.
+
+    .. note::
+
+        Don't block Nuke's main thread on
+        :meth:`~nukedatastore.NukeAPIFuture.result`, the future can only
+        complete once the main thread is idle.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._result = None
+        self._exception = None
+
+    def done(self):
+        """
+        Return whether the operation completed.
+
+        :rtype: bool
+        """
+        return self._event.is_set()
+
+    def _wait(self, timeout=None):
+        """
+        Given a ``timeout`` in seconds, wait for the operation to complete.
+        Raise :class:`~nukedatastore.NukeDataStoreError` if the operation did
+        not complete in time.
+        """
+        self._event.wait(timeout)
+        if not self._event.is_set():
+            raise NukeDataStoreError('Operation timed out')
+
+    def result(self, timeout=None):
+        """
+        Given a ``timeout`` in seconds, wait for the operation to complete
+        and return its result or raise its exception.
+
+        :param timeout: Timeout in seconds, default: ``None``
+        :type timeout: float
+        :return: Result
+        :rtype: :class:`~nukedatastore.NukeAPIResult`
+        """
+        self._wait(timeout)
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Given a ``timeout`` in seconds, wait for the operation to complete
+        and return its exception, or ``None`` if it succeeded.
+
+        :param timeout: Timeout in seconds, default: ``None``
+        :type timeout: float
+        :return: Exception
+        :rtype: :class:`Exception`
+        """
+        self._wait(timeout)
+        return self._exception
+
+    def add_done_callback(self, callback):
+        """
+        Given a ``callback``, call it with the future once the operation
+        completed. If the operation already completed, call it immediately.
+
+        :param callback: Callback
+        :type callback: callable
+        """
+        with self._lock:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _complete(self, result=None, exception=None):
+        """
+        Given a ``result`` or an ``exception``, complete the operation and
+        call all callbacks.
+        """
+        with self._lock:
+            self._result = result
+            self._exception = exception
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+
+class NukeAPIDiskCache(object):
+    """
+    On-disk cache of API responses, shared by all Nuke sessions and render
+    nodes with access to ``path``. Response bodies are stored once per
+    content digest, an index maps URLs to their response and validators.
+    The least recently used responses are evicted once the cache exceeds
+    ``max_size``. All index access is guarded by a file lock, so multiple
+    processes can share the cache.
+
+    :param path: Cache directory
+    :type path: str
+    :param max_size: Maximum size of all responses in bytes, default:
+                     ``DISK_CACHE_SIZE``
+    :type max_size: int
+    :param ttl: Serve responses younger than ``ttl`` seconds without
+                requesting the API, default: ``None``
+    :type ttl: float
+    :param offline: Serve cached responses if the API is unreachable,
+                    default: ``True``
+    :type offline: bool
+
+    Usage:
+
+    >>> from nukedatastore import NukeAPICache, NukeAPIDiskCache
+    >>> disk_cache = NukeAPIDiskCache('/var/tmp/nukedatastore', ttl=60)
+    >>> api_cache = NukeAPICache('api_cache', disk_cache=disk_cache)
+    """
+    def __init__(self, path, max_size=DISK_CACHE_SIZE, ttl=None,
+                 offline=True):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.offline = offline
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(self._get_object_path())
+        except OSError:
+            if not os.path.isdir(self._get_object_path()):
+                raise
+
+    def _get_object_path(self, key=''):
+        """
+        Given a response ``key``, return the path of the response's body.
+
+        :param key: Response key
+        :type key: str
+        :return: Path
+        :rtype: str
+        """
+        return os.path.join(self.path, 'objects', key)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        Context manager, hold the cache's lock across threads and processes.
+        """
+        with self._lock:
+            with open(os.path.join(self.path, 'index.lock'), 'a+b') as f:
+                _lock_file(f)
+                try:
+                    yield
+                finally:
+                    _unlock_file(f)
+
+    def _read_index(self):
+        """
+        Read the cache's index, must be called while holding the lock.
+
+        :return: Entries by URL
+        :rtype: dict
+        """
+        try:
+            with open(os.path.join(self.path, 'index.json'), 'r') as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        """
+        Given an ``index``, replace the cache's index, must be called while
+        holding the lock.
+
+        :param index: Entries by URL
+        :type index: dict
+        """
+        fd, temp = tempfile.mkstemp(dir=self.path)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(index, f)
+        _replace(temp, os.path.join(self.path, 'index.json'))
+
+    def get(self, url):
+        """
+        Given a ``url``, return the cached response's entry or ``None``.
+
+        :param url: URL
+        :type url: str
+        :return: Entry with the response's key, validators, digest and the
+                 time it was stored
+        :rtype: dict
+        """
+        with self._locked():
+            entry = self._read_index().get(url)
+        if entry is None or not os.path.exists(
+                self._get_object_path(entry['key'])):
+            return None
+        return entry
+
+    def fresh(self, entry):
+        """
+        Given an ``entry``, return whether it can be served without
+        requesting the API.
+
+        :param entry: Entry
+        :type entry: dict
+        :rtype: bool
+        """
+        if self.ttl is None:
+            return False
+        return time.time() - entry['stored'] <= self.ttl
+
+    def read(self, entry):
+        """
+        Given an ``entry``, read and decode the cached response's body. If
+        ``ijson`` is installed, the body is memory-mapped and decoded
+        incrementally instead of being read into a buffer.
+
+        :param entry: Entry
+        :type entry: dict
+        :return: Data
+        """
+        path = self._get_object_path(entry['key'])
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        with open(path, 'rb') as f:
+            if ijson is None or not os.fstat(f.fileno()).st_size:
+                return json.loads(f.read().decode('utf-8'))
+            body = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return _load_stream(body)
+            finally:
+                body.close()
+
+    def put(self, url, body, meta):
+        """
+        Given a ``url``, a response ``body`` and its ``meta``, store the
+        response and evict the least recently used responses if the cache
+        exceeds ``max_size``. The body is written while holding the lock, so
+        it cannot be evicted by another process before it is referenced.
+
+        :param url: URL
+        :type url: str
+        :param body: Response body
+        :type body: bytes
+        :param meta: Response validators and digest
+        :type meta: dict
+        :return: Entry
+        :rtype: dict
+        """
+        key = hashlib.sha1(body).hexdigest()
+        path = self._get_object_path(key)
+        entry = {'key': key,
+                 'etag': meta.get('etag'),
+                 'last_modified': meta.get('last_modified'),
+                 'digest': meta.get('digest'),
+                 'stored': time.time()}
+        with self._locked():
+            if os.path.exists(path):
+                os.utime(path, None)
+            else:
+                fd, temp = tempfile.mkstemp(dir=self._get_object_path())
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(body)
+                _replace(temp, path)
+            index = self._read_index()
+            index[url] = entry
+            self._evict(index)
+            self._write_index(index)
+        return entry
+
+    def touch(self, url):
+        """
+        Given a ``url``, record that its cached response was revalidated.
+
+        :param url: URL
+        :type url: str
+        """
+        with self._locked():
+            index = self._read_index()
+            if url in index:
+                index[url]['stored'] = time.time()
+                self._write_index(index)
+
+    def _evict(self, index):
+        """
+        Given an ``index``, remove responses no longer referenced and the
+        least recently used responses until the cache fits ``max_size``.
+        Must be called while holding the lock.
+
+        :param index: Entries by URL
+        :type index: dict
+        """
+        referenced = set(entry['key'] for entry in index.values())
+        objects = []
+        for key in os.listdir(self._get_object_path()):
+            path = self._get_object_path(key)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if key in referenced:
+                objects.append((stat.st_mtime, stat.st_size, key))
+            elif not key.startswith('tmp'):
+                os.remove(path)
+        size = sum(object_size for _, object_size, _ in objects)
+        evicted = set()
+        for _, object_size, key in sorted(objects):
+            if size <= self.max_size:
+                break
+            os.remove(self._get_object_path(key))
+            evicted.add(key)
+            size -= object_size
+        for url, entry in list(index.items()):
+            if entry['key'] in evicted:
+                del index[url]
+
+    def size(self):
+        """
+        Return the size of all cached responses in bytes.
+
+        :rtype: int
+        """
+        return sum(os.path.getsize(self._get_object_path(key))
+                   for key in os.listdir(self._get_object_path()))
 
-for api in api_cache.list():
-    diff = api_cache.diff(api)
-    if diff[api]:
-        result = nuke.ask('API {api} has the following changes on the server:\n\n{diff}\n\nUpdate {api}?'.format(api=api, diff=diff))
-        if result:
-            api_cache.update(api)
-    else:
-        continue"""
+    def clear(self):
+        """
+        Remove all cached responses.
+        """
+        with self._locked():
+            index = {}
+            self._evict(index)
+            self._write_index(index)
 
 
-class NukeDataStoreError(ValueError):
+class _KeyIndex(object):
     """
-    Exception indicating an error related to the Nuke Data Store,
-    inherits from :class:`ValueError`.
+    A data store's key index in memory, the keys in insertion order and as a
+    set for membership tests. ``source`` is the cached value of the index
+    knob the index was read from, ``None`` if the index was scanned from the
+    data store's knobs. ``pending`` indices were edited within a
+    transaction and are only stored once it is flushed.
     """
-    def __init__(self, message):
-        super(NukeDataStoreError, self).__init__(message)
+    def __init__(self, keys, source=None, pending=False):
+        self.keys = keys
+        self.key_set = set(keys)
+        self.source = source
+        self.pending = pending
+        self._sorted_keys = None
+
+    def sorted_keys(self):
+        """
+        Return the keys sorted, reuse them as long as the index is unchanged.
+
+        :return: Sorted data store keys
+        :rtype: list
+        """
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self.keys)
+        return self._sorted_keys
+
+    def add(self, keys):
+        """
+        Given a list of ``keys``, add keys missing from the index.
+
+        :param keys: Data store keys
+        :type keys: list
+        """
+        for key in keys:
+            if key not in self.key_set:
+                self.key_set.add(key)
+                self.keys.append(key)
+        self._sorted_keys = None
+
+    def remove(self, keys):
+        """
+        Given a list of ``keys``, remove the keys from the index.
+
+        :param keys: Data store keys
+        :type keys: list
+        """
+        removed = set(keys)
+        self.keys[:] = [key for key in self.keys if key not in removed]
+        self.key_set.difference_update(removed)
+        self._sorted_keys = None
 
 
-class NukeDataStore(object):
+class NukeDataStore(MutableMapping):
     """
     NukeDataStore class, wrapper around Nuke's NoOp node.
 
     :param name: Data store name
     :type name: str
+    :param cache: Cache decoded values, reads return the shared cached
+                  value, default: ``True``
+    :type cache: bool
+    :param compression: Compress large values with ``zlib`` or ``lzma``,
+                        default: ``None``
+    :type compression: str
+    :param compression_threshold: Minimum size of values to compress in bytes,
+                                  default: ``COMPRESSION_THRESHOLD``
+    :type compression_threshold: int
+    :param serializer: JSON serializer, one of ``SERIALIZERS``, default: the
+                       serializer recorded on the data store or ``json``
+    :type serializer: str
+    :param shard_size: Maximum size of a knob value in bytes, larger values
+                       are split across multiple knobs, default:
+                       ``SHARD_SIZE``, ``None`` disables sharding
+    :type shard_size: int
 
     Usage:
 
@@ -79,8 +1406,31 @@ class NukeDataStore(object):
     >>> print ds['project_data']
     >>> {'id': 1234, 'name': 'project name'}
     """
-    def __init__(self, name):
+    def __init__(self, name, cache=True, compression=None,
+                 compression_threshold=COMPRESSION_THRESHOLD,
+                 serializer=None, shard_size=SHARD_SIZE):
+        if compression and compression not in CODECS:
+            raise NukeDataStoreError('Compression {0} not available'.format(
+                compression))
+        if serializer and serializer not in SERIALIZERS:
+            raise NukeDataStoreError('Serializer {0} not available'.format(
+                serializer))
+        self.serializer = 'json'
+        self._dumps, self._loads = SERIALIZERS[self.serializer]
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.shard_size = shard_size
+        self.cache_enabled = cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.writes_elided = 0
+        self._cache = {}
+        self._index = None
+        self._transaction = None
         self._create_store(name)
+        self._init_serializer(serializer)
+        _INSTANCES.add(self)
+        _install_callbacks()
 
     def _create_store(self, name):
         """
@@ -133,25 +1483,20 @@ class NukeDataStore(object):
         :return: Data store node
         :rtype: :class:`~nuke.Node`
         """
-        kw = {'': '356455a5-3e58-47b7-8d37-3bb37610187b'}
+        kw = {'': STORE_UUID}
         attrs = {
             'label': 'NukeDataStore',
             'hide_input': True,
             'tile_color': 4278190335,
             FROZEN_ATTR: self._to_json(False)
         }
-        store = None
-        try:
-            nodes = get_nodes(**kw)
-            for node in nodes:
-                if node.name() == name:
-                    store = node
-            assert store
-        except (AssertionError, NukeUUIDError):
+        store = _find_store(name)
+        if store is None:
             store = nuke.nodes.NoOp(name=name)
             set_uuid(store, **kw)
+            _register_store(store)
             store.addKnob(self._create_knob(FROZEN_ATTR))
-            for attr, value in attrs.iteritems():
+            for attr, value in attrs.items():
                 store[attr].setValue(value)
             if api_cache:
                 actions_tab = nuke.Tab_Knob('actions', 'Actions')
@@ -162,6 +1507,34 @@ class NukeDataStore(object):
                 store.addKnob(update_btn)
         return store
 
+    def _init_serializer(self, serializer=None):
+        """
+        Given a ``serializer``, record it on the data store. If no
+        ``serializer`` is given, use the serializer recorded on the data
+        store. Fall back to ``json`` if the recorded serializer is not
+        available, all serializers read and write plain JSON.
+
+        :param serializer: Serializer name
+        :type serializer: str
+        """
+        if serializer:
+            try:
+                knob = self.store[SERIALIZER_ATTR]
+            except NameError:
+                knob = self._create_knob(SERIALIZER_ATTR)
+                self.store.addKnob(knob)
+            if knob.value() != serializer:
+                knob.setValue(serializer)
+        else:
+            try:
+                serializer = self.store[SERIALIZER_ATTR].value()
+            except NameError:
+                serializer = 'json'
+        if serializer not in SERIALIZERS:
+            serializer = 'json'
+        self.serializer = serializer
+        self._dumps, self._loads = SERIALIZERS[serializer]
+
     def _create_knob(self, attr):
         """
         Given an ``attr``, create and return a new :class:`~nuke.Text_Knob` of
@@ -201,25 +1574,245 @@ class NukeDataStore(object):
 
     def _to_json(self, value):
         """
-        Given a ``value``, encode to JSON and return.
+        Given a ``value``, encode to JSON with the data store's serializer and
+        return, values that are already encoded are used as is. Compress the
+        encoded value if compression is enabled.
 
         :param value: Decoded value
         :type value: str
         :return: JSON-encoded value
         :rtype: str
         """
-        return json.dumps(value)
+        if isinstance(value, _Encoded):
+            return self._compress(value.json)
+        return self._compress(self._dumps(value))
 
     def _from_json(self, value):
         """
-        Given a ``value``, decode from JSON and return.
+        Given a ``value``, decode from JSON with the data store's serializer
+        and return. Compressed values are detected by their codec prefix and
+        decompressed first.
+
+        :param value: JSON-encoded value
+        :type value: str
+        :return: Decoded value
+        :rtype: str
+        """
+        return self._loads(self._decompress(value))
+
+    def _compress(self, value):
+        """
+        Given a JSON-encoded ``value``, compress and base64-encode it if
+        compression is enabled and ``value`` exceeds the compression
+        threshold. Compressed values are prefixed with their codec, i.e.
+        ``@zlib:``.
 
         :param value: JSON-encoded value
         :type value: str
+        :return: Encoded value
+        :rtype: str
+        """
+        if not self.compression or len(value) < self.compression_threshold:
+            return value
+        compress = CODECS[self.compression][0]
+        payload = base64.b64encode(compress(value.encode('utf-8')))
+        encoded = '{0}{1}:{2}'.format(CODEC_PREFIX, self.compression,
+                                      payload.decode('ascii'))
+        if len(encoded) >= len(value):
+            return value
+        return encoded
+
+    def _decompress(self, value):
+        """
+        Given an encoded ``value``, decompress it if it carries a codec
+        prefix. Raise :class:`~nukedatastore.NukeDataStoreError` if the codec
+        is not available.
+
+        :param value: Encoded value
+        :type value: str
+        :return: JSON-encoded value
+        :rtype: str
+        """
+        if not value.startswith(CODEC_PREFIX):
+            return value
+        codec, _, payload = value[len(CODEC_PREFIX):].partition(':')
+        try:
+            decompress = CODECS[codec][1]
+        except KeyError:
+            raise NukeDataStoreError('Codec {0} not available'.format(codec))
+        return decompress(base64.b64decode(payload)).decode('utf-8')
+
+    def _read(self, attr):
+        """
+        Given an ``attr``, read and decode the value of the attribute's knob.
+        Decoded values are cached and only decoded again once the knob's raw
+        value changes. Raise :class:`NameError` if ``attr`` does not exist.
+        Cached values are shared by all reads, don't mutate them.
+
+        :param attr: Attribute name
+        :type attr: str
         :return: Decoded value
+        """
+        if self._transaction and attr in self._transaction:
+            if self._transaction[attr] is None:
+                raise NameError(attr)
+            return self._from_json(self._transaction[attr])
+        raw = self.store[attr].value()
+        if not self.cache_enabled:
+            return self._from_json(self._join_shards(attr, raw))
+        cached = self._cache.get(attr)
+        if cached is not None and cached[0] == raw:
+            self.cache_hits += 1
+            return cached[1]
+        self.cache_misses += 1
+        value = self._from_json(self._join_shards(attr, raw))
+        self._cache[attr] = (raw, value)
+        return value
+
+    def _get_shard_attr(self, attr, index):
+        """
+        Given an ``attr`` and a shard ``index``, return the name of the
+        shard's attribute.
+
+        :param attr: Attribute name
+        :type attr: str
+        :param index: Shard index
+        :type index: int
+        :return: Shard attribute name
+        :rtype: str
+        """
+        return '{shard_prefix}{attr}_{index}'.format(shard_prefix=SHARD_PREFIX,
+                                                     attr=attr, index=index)
+
+    def _get_manifest(self, raw):
+        """
+        Given the ``raw`` value of an attribute's knob, return the digests of
+        the attribute's shards, or an empty list if it is not sharded.
+
+        :param raw: Raw knob value
+        :type raw: str
+        :return: Shard digests
+        :rtype: list
+        """
+        if raw is None or not raw.startswith(MANIFEST_PREFIX):
+            return []
+        return json.loads(raw[len(MANIFEST_PREFIX):])['shards']
+
+    def _join_shards(self, attr, raw):
+        """
+        Given an ``attr`` and the ``raw`` value of its knob, reassemble and
+        return the attribute's value if it is sharded, otherwise return
+        ``raw``. Raise :class:`~nukedatastore.NukeDataStoreError` if a shard
+        is missing.
+
+        :param attr: Attribute name
+        :type attr: str
+        :param raw: Raw knob value
+        :type raw: str
+        :return: Serialised value
+        :rtype: str
+        """
+        if not raw.startswith(MANIFEST_PREFIX):
+            return raw
+        shards = []
+        for index in range(len(self._get_manifest(raw))):
+            shard_attr = self._get_shard_attr(attr, index)
+            try:
+                shards.append(self.store[shard_attr].value())
+            except NameError:
+                raise NukeDataStoreError('Shard {0} missing'.format(
+                    shard_attr))
+        return ''.join(shards)
+
+    def _write_shards(self, attr, serialised_data, previous):
+        """
+        Given an ``attr``, ``serialised_data`` and the digests of the
+        ``previous`` shards, split ``serialised_data`` into shards of up to
+        ``shard_size`` bytes and set the shards that changed. Remove shards
+        no longer in use.
+
+        :param attr: Attribute name
+        :type attr: str
+        :param serialised_data: JSON-encoded value
+        :type serialised_data: str
+        :param previous: Previous shard digests
+        :type previous: list
+        :return: Manifest
         :rtype: str
         """
-        return json.loads(value)
+        digests = []
+        size = self.shard_size
+        for index, start in enumerate(range(0, len(serialised_data), size)):
+            shard = serialised_data[start:start + size]
+            digest = hashlib.sha1(shard.encode('utf-8')).hexdigest()
+            digests.append(digest)
+            if index < len(previous) and previous[index] == digest:
+                self.writes_elided += 1
+            else:
+                self._set_knob(self._get_shard_attr(attr, index), shard)
+        self._remove_shards(attr, previous, len(digests))
+        return '{0}{1}'.format(MANIFEST_PREFIX,
+                                json.dumps({'shards': digests}))
+
+    def _remove_shards(self, attr, previous, start=0):
+        """
+        Given an ``attr`` and the digests of its ``previous`` shards, remove
+        all shards from index ``start`` onwards.
+
+        :param attr: Attribute name
+        :type attr: str
+        :param previous: Previous shard digests
+        :type previous: list
+        :param start: First shard to remove, default: ``0``
+        :type start: int
+        """
+        for index in range(start, len(previous)):
+            try:
+                self.store.removeKnob(
+                    self.store[self._get_shard_attr(attr, index)])
+            except NameError:
+                continue
+
+    def _remove_attr(self, attr):
+        """
+        Given an ``attr``, remove the attribute's knob and shards, if any.
+
+        :param attr: Attribute name
+        :type attr: str
+        """
+        if self._transaction is not None:
+            self._transaction[attr] = None
+            return
+        try:
+            knob = self.store[attr]
+        except NameError:
+            return
+        self._remove_shards(attr, self._get_manifest(knob.value()))
+        self.store.removeKnob(knob)
+        _invalidate(self.store, attr)
+
+    def _invalidate(self, attr):
+        """
+        Given an ``attr``, drop its cached decoded value, and the key index
+        if it was built from the data store's knobs.
+
+        :param attr: Attribute name
+        :type attr: str
+        """
+        self._cache.pop(attr, None)
+        index = self._index
+        if attr.startswith(DS_PREFIX) and index is not None and \
+                index.source is None and not index.pending:
+            self._index = None
+
+    def clear_cache(self):
+        """
+        Clear all cached decoded values and reset the cache hit and miss
+        counters.
+        """
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def __getitem__(self, key):
         try:
@@ -227,74 +1820,530 @@ class NukeDataStore(object):
         except KeyError as e:
             raise KeyError(e)
 
-    def _get_item(self, key, ds_attr=True):
+    def _get_item(self, key, ds_attr=True):
+        """
+        Given a ``key`` get data attribute ``key``. Raise :class:`KeyError`, if
+        key does not exist.
+
+        :param key: Data store key
+        :type key: str
+        :param ds_attr: Prefix ``key`` with DS_PREFIX
+        :type ds_attr: bool
+        """
+        try:
+            if ds_attr:
+                return self._read(self._get_ds_attr(key))
+            else:
+                return self._read(key)
+        except NameError:
+            raise KeyError(key)
+
+    def _check_frozen(self):
+        """
+        Check if instance is frozen and raise
+        :class:`~nukedatastore.NukeDataStoreError` if frozen.
+        """
+        if self.is_frozen():
+            raise NukeDataStoreError('Cannot mutate frozen {0}'.format(
+                self.__class__.__name__))
+
+    def __setitem__(self, key, value):
+        self._check_frozen()
+        self._set_item(key, value)
+
+    def __delitem__(self, key):
+        self._check_frozen()
+        if key not in self:
+            raise KeyError(key)
+        self._delete([key])
+
+    def _delete(self, keys):
+        """
+        Given a list of ``keys``, remove the keys' knobs and remove the keys
+        from the key index.
+
+        :param keys: Data store keys
+        :type keys: list
+        """
+        for key in keys:
+            self._remove_attr(self._get_ds_attr(key))
+        self._remove_keys(keys)
+
+    def _set_item(self, key, value, ds_attr=True):
+        """
+        Given a ``key``, ``value`` pair, set ``value`` on attribute ``key``.
+        Raise :class:`~nukedatastore.NukeDataStoreError` is data is not JSON
+        serialisable.
+
+        :param key: Data store key
+        :type key: str
+        :param value: Data
+        :type value: str, int, float, bool, list, dict
+        :param ds_attr: Prefix ``key`` with DS_PREFIX
+        :type ds_attr: bool
+        """
+        if ds_attr:
+            key = self._get_ds_attr(key)
+        try:
+            serialised_data = self._to_json(value)
+        except (TypeError, ValueError, OverflowError):
+            raise NukeDataStoreError('Data not serialisable')
+        self._write(key, serialised_data)
+        if ds_attr:
+            self._add_keys([self._strip_ds_attr(key)])
+
+    def _set_items(self, mapping, ds_attr=True):
+        """
+        Given a ``mapping`` of keys and values, serialise all values first and
+        then set them, adding missing knobs in bulk. Raise
+        :class:`~nukedatastore.NukeDataStoreError` before any data is set if
+        data is not JSON serialisable.
+
+        :param mapping: Keys and values
+        :type mapping: dict
+        :param ds_attr: Prefix keys with DS_PREFIX
+        :type ds_attr: bool
+        """
+        items = []
+        for key, value in mapping.items():
+            if ds_attr:
+                key = self._get_ds_attr(key)
+            try:
+                items.append((key, self._to_json(value)))
+            except (TypeError, ValueError, OverflowError):
+                raise NukeDataStoreError('Data not serialisable')
+        if self._transaction is None:
+            knobs = self.store.knobs()
+            for key, _ in items:
+                if key not in knobs:
+                    self.store.addKnob(self._create_knob(key))
+        for key, serialised_data in items:
+            self._write(key, serialised_data)
+        if ds_attr:
+            self._add_keys([self._strip_ds_attr(key) for key, _ in items])
+
+    def _write(self, attr, serialised_data):
+        """
+        Given an ``attr`` and ``serialised_data``, set the attribute's knob,
+        create the knob if it does not exist. Values larger than
+        ``shard_size`` are split across shard knobs and the attribute's knob
+        is set to the shards' manifest. Knobs whose value is unchanged are
+        not set, to avoid marking the script modified and triggering
+        knobChanged callbacks, elided writes are counted in
+        ``writes_elided``.
+
+        :param attr: Attribute name
+        :type attr: str
+        :param serialised_data: JSON-encoded value
+        :type serialised_data: str
+        """
+        if self._transaction is not None:
+            self._transaction[attr] = serialised_data
+            return
+        try:
+            current = self.store[attr].value()
+        except NameError:
+            current = None
+        previous = self._get_manifest(current)
+        if self.shard_size and len(serialised_data) > self.shard_size:
+            serialised_data = self._write_shards(attr, serialised_data,
+                                                 previous)
+        elif previous:
+            self._remove_shards(attr, previous)
+        if serialised_data == current:
+            self.writes_elided += 1
+            return
+        self._set_knob(attr, serialised_data)
+        _invalidate(self.store, attr)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Context manager, buffer all writes to the
+        :class:`~nukedatastore.NukeDataStore` in memory and apply them in a
+        single undo group on exit. Reads within the transaction see the
+        buffered writes and deletes. If an exception is raised, buffered
+        writes are discarded and the data store is left unchanged. Nested
+        transactions join the outermost transaction.
+
+        Usage:
+
+        >>> with ds.transaction():
+        ...     ds['shot_data'] = {'id': 1}
+        ...     ds['asset_data'] = {'id': 2}
+        """
+        if self._transaction is not None:
+            yield self
+            return
+        self._transaction = {}
+        try:
+            yield self
+            pending = self._transaction
+            if self._index is not None and self._index.pending:
+                pending[INDEX_ATTR] = self._to_json(self._index.keys)
+        finally:
+            self._transaction = None
+            if self._index is not None and self._index.pending:
+                self._index = None
+        self._flush(pending)
+
+    def _flush(self, pending):
+        """
+        Given ``pending`` serialised data by attribute, set all attributes
+        in a single undo group. If setting an attribute fails, restore all
+        attributes set so far and re-raise.
+
+        :param pending: Serialised data by attribute name, ``None`` for
+                        removed attributes
+        :type pending: dict
+        """
+        undo = nuke.Undo()
+        undo.begin('{0} transaction'.format(self.store.name()))
+        previous = {}
+        try:
+            knobs = self.store.knobs()
+            for attr, serialised_data in pending.items():
+                if attr in knobs:
+                    previous[attr] = self._join_shards(
+                        attr, self.store[attr].value())
+                elif serialised_data is None:
+                    continue
+                else:
+                    previous[attr] = None
+                    self.store.addKnob(self._create_knob(attr))
+                if serialised_data is None:
+                    self._remove_attr(attr)
+                else:
+                    self._write(attr, serialised_data)
+        except Exception:
+            for attr, serialised_data in previous.items():
+                if serialised_data is None:
+                    self._remove_attr(attr)
+                else:
+                    self._write(attr, serialised_data)
+            raise
+        finally:
+            undo.end()
+
+    def _set_knob(self, attr, value):
+        """
+        Given an ``attr`` and a ``value``, set the attribute's knob, create
+        the knob if it does not exist.
+
+        :param attr: Attribute name
+        :type attr: str
+        :param value: Raw knob value
+        :type value: str
+        """
+        try:
+            self.store[attr].setValue(value)
+        except NameError:
+            self.store.addKnob(self._create_knob(attr))
+            self.store[attr].setValue(value)
+
+    def get_path(self, key, *path):
+        """
+        Given a ``key`` and a ``path`` of dictionary keys and list indices,
+        return the data at ``path``. Raise :class:`KeyError`, if key or path
+        does not exist. The data is decoded once and served from the cache
+        on subsequent reads, treat it as read-only.
+
+        :param key: Data store key
+        :type key: str
+        :param \*path: Dictionary keys and list indices
+        :return: Data
+
+        Usage:
+
+        >>> ds.get_path('shots', 'sq010', 'sh020')
+        """
+        data = self._get_item(key)
+        for item in path:
+            try:
+                data = data[item]
+            except (KeyError, IndexError, TypeError):
+                raise KeyError(item)
+        return data
+
+    def get_many(self, keys):
+        """
+        Given a list of ``keys``, return a dictionary of keys and data. Raise
+        :class:`KeyError`, if a key does not exist.
+
+        :param keys: Data store keys
+        :type keys: list
+        :return: Keys and data
+        :rtype: dict
+        """
+        return dict((key, self[key]) for key in keys)
+
+    def set_many(self, mapping):
+        """
+        Given a ``mapping`` of keys and values, set all values in one pass.
+        The frozen state is only checked once and missing keys are created in
+        bulk.
+
+        :param mapping: Keys and values
+        :type mapping: dict
+        """
+        self._check_frozen()
+        self._set_items(mapping)
+
+    def update(self, *args, **kwargs):
+        """
+        Update the :class:`~nukedatastore.NukeDataStore` from a mapping or
+        an iterable of key, value pairs and/or keyword arguments, like
+        :meth:`dict.update`.
+        """
+        self.set_many(dict(*args, **kwargs))
+
+    def _get_index(self):
+        """
+        Return the data store's key index. Data stores without an index are
+        indexed from their knobs in memory, the index is only stored once the
+        data store is written or :meth:`rebuild_index` is called.
+
+        :return: Data store keys
+        :rtype: list
+        """
+        return self._get_key_index().keys
+
+    def _get_key_index(self):
+        """
+        Return the data store's key index in memory, reuse it as long as the
+        index is served from the cache. Within a transaction, changes to the
+        index are kept in memory until the transaction is flushed.
+
+        :return: Key index
+        :rtype: :class:`_KeyIndex`
+        """
+        index = self._index
+        if index is not None and index.pending:
+            return index
+        try:
+            keys = self._read(INDEX_ATTR)
+        except NameError:
+            if index is None or index.source is not None:
+                self._index = _KeyIndex(self._scan_index())
+            return self._index
+        if index is None or index.source is not keys:
+            self._index = _KeyIndex(keys, source=keys)
+        return self._index
+
+    def _scan_index(self):
+        """
+        Return the data store's keys from the data store's knobs.
+
+        :return: Data store keys
+        :rtype: list
+        """
+        return [self._strip_ds_attr(key) for key in self.store.knobs()
+                if key.startswith(DS_PREFIX)]
+
+    def _edit_index(self):
+        """
+        Return the data store's key index to be edited in place. Within a
+        transaction, a copy is edited.
+
+        :return: Key index
+        :rtype: :class:`_KeyIndex`
+        """
+        index = self._get_key_index()
+        if self._transaction is not None and not index.pending:
+            index = self._index = _KeyIndex(list(index.keys), pending=True)
+        return index
+
+    def _store_index(self):
+        """
+        Set the data store's key index knob from the key index in memory and
+        keep the index cached. Within a transaction, the index is set once
+        the transaction is flushed.
+        """
+        if self._transaction is not None:
+            return
+        index = self._index
+        try:
+            self._write(INDEX_ATTR, self._to_json(index.keys))
+        except Exception:
+            self._index = None
+            raise
+        if self.cache_enabled:
+            self._cache[INDEX_ATTR] = (self.store[INDEX_ATTR].value(),
+                                       index.keys)
+            index.source = index.keys
+
+    def _add_keys(self, keys):
+        """
+        Given a list of ``keys``, add keys missing from the key index.
+
+        :param keys: Data store keys
+        :type keys: list
+        """
+        index = self._get_key_index()
+        added = [key for key in keys if key not in index.key_set]
+        if not added and (index.source is not None or index.pending):
+            return
+        self._edit_index().add(added)
+        self._store_index()
+
+    def _remove_keys(self, keys):
+        """
+        Given a list of ``keys``, remove the keys from the key index.
+
+        :param keys: Data store keys
+        :type keys: list
+        """
+        self._edit_index().remove(keys)
+        self._store_index()
+
+    def rebuild_index(self):
+        """
+        Rebuild and store the key index from the data store's knobs. Data
+        stores created before the key index was introduced, or modified by
+        older versions, are indexed this way.
+
+        :return: Data store keys
+        :rtype: list
+        """
+        keys = self._scan_index()
+        self._index = _KeyIndex(keys, pending=self._transaction is not None)
+        self._store_index()
+        return list(keys)
+
+    def list(self):
+        """
+        List all available keys in the :class:`~nukedatastore.NukeDataStore`.
+        """
+        return list(self._get_index())
+
+    def keys(self):
+        """
+        Return all available keys in the
+        :class:`~nukedatastore.NukeDataStore`.
+
+        :return: Data store keys
+        :rtype: list
+        """
+        return self.list()
+
+    def items(self):
         """
-        Given a ``key`` get data attribute ``key``. Raise :class:`KeyError`, if
-        key does not exist.
+        Return all key, data pairs in the
+        :class:`~nukedatastore.NukeDataStore`.
 
-        :param key: Data store key
-        :type key: str
-        :param ds_attr: Prefix ``key`` with DS_PREFIX
-        :type ds_attr: bool
+        :return: Key, data pairs
+        :rtype: list
         """
-        try:
-            if ds_attr:
-                return self._from_json(
-                    self.store[self._get_ds_attr(key)].value())
-            else:
-                return self._from_json(self.store[key].value())
-        except NameError:
-            raise KeyError(key)
+        return [(key, self[key]) for key in self.list()]
 
-    def _check_frozen(self):
+    def iter_prefix(self, prefix):
         """
-        Check if instance is frozen and raise
-        :class:`~nukedatastore.NukeDataStoreError` if frozen.
+        Given a ``prefix``, iterate over all keys starting with ``prefix``
+        in sorted order. Keys are looked up in the key index, not the data
+        store's knobs.
+
+        Usage:
+
+        >>> list(ds.iter_prefix('shot_'))
+        ['shot_data', 'shot_notes']
+
+        :param prefix: Key prefix
+        :type prefix: str
+        :return: Data store keys
+        :rtype: iterator
         """
-        if self.is_frozen():
-            raise NukeDataStoreError('Cannot mutate frozen {0}'.format(
-                self.__class__.__name__))
+        keys = self._get_key_index().sorted_keys()
+        for key in keys[bisect.bisect_left(keys, prefix):]:
+            if not key.startswith(prefix):
+                break
+            yield key
 
-    def __setitem__(self, key, value):
+    def clear(self):
+        """
+        Remove all keys from the :class:`~nukedatastore.NukeDataStore`.
+        """
         self._check_frozen()
-        self._set_item(key, value)
+        self._delete(self.list())
 
-    def _set_item(self, key, value, ds_attr=True):
+    def _orphaned(self, attr, knobs):
         """
-        Given a ``key``, ``value`` pair, set ``value`` on attribute ``key``.
-        Raise :class:`~nukedatastore.NukeDataStoreError` is data is not JSON
-        serialisable.
+        Given an ``attr`` and the names of all ``knobs`` on the data store,
+        check whether ``attr`` belongs to a key that no longer exists.
 
-        :param key: Data store key
-        :type key: str
-        :param value: Data
-        :type value: str, int, float, bool, list, dict
-        :param ds_attr: Prefix ``key`` with DS_PREFIX
-        :type ds_attr: bool
+        :param attr: Attribute name
+        :type attr: str
+        :param knobs: Knob names
+        :type knobs: dict
+        :return: ``True`` if ``attr`` is orphaned
+        :rtype: bool
         """
-        if ds_attr:
-            key = self._get_ds_attr(key)
-        try:
-            serialised_data = self._to_json(value)
-        except TypeError:
-            raise NukeDataStoreError('Data not serialisable')
+        if attr.startswith(SHARD_PREFIX):
+            parent, index = attr[len(SHARD_PREFIX):].rsplit('_', 1)
+            if parent not in knobs:
+                return True
+            manifest = self._get_manifest(self.store[parent].value())
+            return int(index) >= len(manifest)
+        if attr.startswith(META_PREFIX):
+            return self._get_ds_attr(attr[len(META_PREFIX):]) not in knobs
+        return False
+
+    def compact(self):
+        """
+        Remove knobs left behind by deleted keys, such as orphaned shards
+        and metadata, and rebuild the key index, dropping keys without data.
+        Raise :class:`~nukedatastore.NukeDataStoreError` within a transaction.
+
+        :return: Removed attribute names
+        :rtype: list
+        """
+        self._check_frozen()
+        if self._transaction is not None:
+            raise NukeDataStoreError('Cannot compact within a transaction')
+        knobs = self.store.knobs()
+        removed = sorted(attr for attr in knobs
+                         if self._orphaned(attr, knobs))
+        for attr in removed:
+            self.store.removeKnob(self.store[attr])
+            _invalidate(self.store, attr)
+        self.rebuild_index()
+        return removed
+
+    def __contains__(self, key):
+        if key in self._get_key_index().key_set:
+            return True
+        attr = self._get_ds_attr(key)
+        if self._transaction and attr in self._transaction:
+            return self._transaction[attr] is not None
         try:
-            self.store[key].setValue(serialised_data)
+            self.store[attr]
         except NameError:
-            self.store.addKnob(self._create_knob(key))
-            self.store[key].setValue(serialised_data)
+            return False
+        return True
 
-    def list(self):
-        """
-        List all available keys in the :class:`~nukedatastore.NukeDataStore`.
-        """
-        return [self._strip_ds_attr(key) for key in self.store.knobs()
-                if key.startswith(DS_PREFIX)]
+    def __iter__(self):
+        return iter(self.list())
+
+    def __len__(self):
+        return len(self._get_index())
+
+    def __bool__(self):
+        return True
+
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        return self is other
+
+    def __ne__(self, other):
+        return self is not other
+
+    __hash__ = object.__hash__
 
     def is_frozen(self):
         """
         Return whether the data in the :class:`~nukedatastore.NukeDataStore`
-        is frozen and therefore unchangeable.
+        is frozen and therefore unchangeable. The frozen knob is only decoded
+        again after its raw value changed.
         """
         return self._get_item(FROZEN_ATTR, ds_attr=False)
 
@@ -312,9 +2361,41 @@ class NukeDataStore(object):
         """
         self._set_item(FROZEN_ATTR, False, ds_attr=False)
 
+    @contextlib.contextmanager
+    def frozen(self):
+        """
+        Context manager, temporarily freeze the data in the
+        :class:`~nukedatastore.NukeDataStore` and restore the previous frozen
+        state on exit.
+        """
+        was_frozen = self.is_frozen()
+        if not was_frozen:
+            self.freeze()
+        try:
+            yield self
+        finally:
+            if not was_frozen:
+                self.unfreeze()
+
+    @contextlib.contextmanager
+    def unfrozen(self):
+        """
+        Context manager, temporarily unfreeze the data in the
+        :class:`~nukedatastore.NukeDataStore` and restore the previous frozen
+        state on exit.
+        """
+        was_frozen = self.is_frozen()
+        if was_frozen:
+            self.unfreeze()
+        try:
+            yield self
+        finally:
+            if was_frozen:
+                self.freeze()
+
     def __repr__(self):
         return '<NukeDataStore: {0}, Keys: {1}>'.format(self.store.name(),
-                                                        len(self.list()))
+                                                        len(self))
 
 
 class NukeAPICache(NukeDataStore):
@@ -323,6 +2404,24 @@ class NukeAPICache(NukeDataStore):
 
     :param name: Data store name
     :type name: str
+    :param workers: Maximum number of concurrent requests, default:
+                    ``MAX_WORKERS``
+    :type workers: int
+    :param session: Session to perform requests with, default: a session
+                    shared by all instances, see
+                    :func:`~nukedatastore.create_session`
+    :type session: :class:`requests.Session`
+    :param timeout: Request timeout in seconds or a (connect, read) tuple,
+                    default: ``TIMEOUT``
+    :type timeout: float, tuple
+    :param disk_cache: On-disk response cache or its directory, default: the
+                       directory in the ``NUKEDATASTORE_DISK_CACHE``
+                       environment variable, if set
+    :type disk_cache: :class:`~nukedatastore.NukeAPIDiskCache`, str
+    :param stream: Decode responses while they are downloaded instead of
+                   buffering them, requires ``ijson``, default: ``False``
+    :type stream: bool
+    :param \**kwargs: See :class:`~nukedatastore.NukeDataStore`
 
     Usage:
 
@@ -332,8 +2431,33 @@ class NukeAPICache(NukeDataStore):
     >>> print api_cache['project_data']
     >>> {'id': 1234, 'name': 'project name'}
     """
-    def __init__(self, name):
-        super(NukeAPICache, self).__init__(name)
+    def __init__(self, name, workers=MAX_WORKERS, session=None,
+                 timeout=TIMEOUT, disk_cache=None, stream=False, **kwargs):
+        if disk_cache is None:
+            disk_cache = os.environ.get(DISK_CACHE_ENV)
+        if isinstance(disk_cache, string_types):
+            disk_cache = NukeAPIDiskCache(disk_cache)
+        self.disk_cache = disk_cache
+        self.stream = stream
+        self.workers = workers
+        self.timeout = timeout
+        self.refresh_errors = {}
+        self._session = session
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        super(NukeAPICache, self).__init__(name, **kwargs)
+
+    @property
+    def session(self):
+        """
+        Return the session used to perform requests.
+
+        :return: Session
+        :rtype: :class:`requests.Session`
+        """
+        if self._session is None:
+            return _get_session()
+        return self._session
 
     def _create_store(self, name):
         """
@@ -349,6 +2473,22 @@ class NukeAPICache(NukeDataStore):
                                   'to set the data manually, use '
                                   'NukeDataStore as a generic data store')
 
+    def set_many(self, mapping):
+        raise NotImplementedError('Please update API cache instead of trying '
+                                  'to set the data manually, use '
+                                  'NukeDataStore as a generic data store')
+
+    def _delete(self, keys):
+        """
+        Given a list of ``keys``, remove the APIs' data and metadata.
+
+        :param keys: API names
+        :type keys: list
+        """
+        super(NukeAPICache, self)._delete(keys)
+        for key in keys:
+            self._remove_attr(self._get_meta_attr(key))
+
     def _check_exists(self, name):
         """
         Check if API is already registered on the instance, raise
@@ -360,10 +2500,27 @@ class NukeAPICache(NukeDataStore):
         except KeyError:
             pass
 
-    def register(self, name, url, update=True, ignore_exists=True):
+    def register(self, name, url, update=True, ignore_exists=True, ttl=None,
+                 max_age=None, fields=None, where=None):
         """
         Given a ``name`` and a ``url``, register a new API in the cache.
 
+        Reading an API that was checked more than ``ttl`` seconds ago
+        returns the cached data immediately and refreshes the API in the
+        background. Reading an API that was checked more than ``max_age``
+        seconds ago blocks until the API is updated.
+
+        APIs registered with ``fields`` only store the listed fields of the
+        API's data, lists are reduced record by record. APIs registered with
+        a ``where`` filter only store the records of list data that match
+        the filter. Diffs only compare the stored fields and records.
+
+        Usage:
+
+        >>> api_cache.register('shots', 'https://shots.your.domain.com/api',
+        ...                    fields=['id', 'name', 'status.code'],
+        ...                    where={'status.code': ['ip', 'rev']})
+
         :param name: API name
         :type name: str
         :param url: API URL
@@ -372,18 +2529,37 @@ class NukeAPICache(NukeDataStore):
         :type update: bool
         :param ignore_exists: Ignore API is already registered, default: ``True``
         :type ignore_exists: bool
+        :param ttl: Time to live in seconds, default: ``None``
+        :type ttl: float
+        :param max_age: Maximum age in seconds, default: ``None``
+        :type max_age: float
+        :param fields: Dotted or JSONPath names of the fields to store, e.g.
+                       ``status.code`` or ``$[*].status.code``, default:
+                       ``None``
+        :type fields: list
+        :param where: Dotted field names mapped to the value or list of
+                      values records must match, default: ``None``
+        :type where: dict
         """
         self._check_frozen()
+        if where is not None and not isinstance(where, dict):
+            raise NukeDataStoreError('Filter must be a dict')
+        if fields:
+            fields = [_normalize_field(field) for field in fields]
         if not ignore_exists:
             self._check_exists(name)
         self._set_item(name, [url, None, None])
+        self._set_meta(name, {'url': url, 'timestamp': None, 'ttl': ttl,
+                              'max_age': max_age, 'fields': fields,
+                              'where': where})
         if update:
             self.update(name)
 
     def timestamp(self, *args):
         """
         Given \*args, return timestamps for specified APIs, if no APIs are
-        specified, return timestamps for all registered APIs.
+        specified, return timestamps for all registered APIs. Only reads the
+        APIs' metadata, not their data.
 
         :param \*args: API names
         :type \*args: str
@@ -394,72 +2570,735 @@ class NukeAPICache(NukeDataStore):
             args = self.list()
         response = []
         for api_name in args:
-            response.append((api_name, self._get_api(api_name)[1]))
+            timestamp = self._get_meta(api_name)['timestamp']
+            response.append((api_name, timestamp))
         return response
 
-    def _get_request(self, url):
+    def _get_meta_attr(self, key):
+        """
+        Given a ``key``, return the name of the API's metadata attribute.
+
+        :param key: Data store key
+        :type key: str
+        :return: Metadata attribute name
+        :rtype: str
+        """
+        return '{meta_prefix}{key}'.format(meta_prefix=META_PREFIX, key=key)
+
+    def _get_meta(self, key):
+        """
+        Given a ``key``, return the API's metadata. Metadata is stored
+        separately from the API's data, so it can be read without decoding
+        the data. For APIs cached before metadata was recorded, URL and
+        timestamp are read from the API's data. Raise :class:`KeyError`, if
+        key does not exist.
+
+        :param key: Data store key
+        :type key: str
+        :return: Metadata
+        :rtype: dict
+
+        Metadata format:
+
+        >>> {'url': url, 'timestamp': timestamp, 'etag': etag,
+        ...  'last_modified': last_modified, 'digest': digest,
+        ...  'checked': timestamp, 'ttl': ttl, 'max_age': max_age}
+        """
+        try:
+            meta = self._get_item(self._get_meta_attr(key), ds_attr=False)
+        except KeyError:
+            meta = {}
+        if 'url' not in meta:
+            url, timestamp = self._get_api(key)[:2]
+            meta = dict(meta, url=url, timestamp=timestamp)
+        return meta
+
+    def metadata(self, key):
+        """
+        Given a ``key``, return the API's metadata without reading its data.
+        Raise :class:`KeyError`, if key does not exist.
+
+        :param key: Data store key
+        :type key: str
+        :return: Metadata
+        :rtype: dict
+        """
+        return _copy(self._get_meta(key))
+
+    def _set_meta(self, key, meta):
+        """
+        Given a ``key`` and ``meta``, set the API's metadata.
+
+        :param key: Data store key
+        :type key: str
+        :param meta: Metadata
+        :type meta: dict
+        """
+        self._set_item(self._get_meta_attr(key), meta, ds_attr=False)
+
+    def _get_request(self, url, headers=None, stream=False):
         """
         Given a ``url``, perform a GET request on that URL and make sure
         status code is valid.
 
         :param url: URL
         :type url: str
+        :param headers: Request headers
+        :type headers: dict
+        :param stream: Defer downloading the response body, default:
+                       ``False``
+        :type stream: bool
         """
-        request = requests.get(url)
         try:
+            request = self.session.get(url, headers=headers,
+                                       timeout=self.timeout, stream=stream)
             request.raise_for_status()
-        except requests.RequestException:
-            raise NukeDataStoreError('Request failed')
+        except requests.RequestException as e:
+            error = NukeDataStoreError('Request failed: {0}'.format(e))
+            error.response = getattr(e, 'response', None)
+            raise error
         return request
 
-    def diff(self, *args):
+    def _prepare(self, api_names):
+        """
+        Given a list of ``api_names``, read the APIs' metadata and build
+        their request headers. APIs with cached data are revalidated with
+        their ETag or Last-Modified validators.
+
+        :param api_names: API names
+        :type api_names: list
+        :return: API metadata and request headers by API name
+        :rtype: tuple
+        """
+        apis = {}
+        headers = {}
+        for api_name in api_names:
+            meta = apis[api_name] = self._get_meta(api_name)
+            headers[api_name] = {}
+            if meta['timestamp'] is None:
+                continue
+            if meta.get('etag'):
+                headers[api_name]['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers[api_name]['If-Modified-Since'] = meta['last_modified']
+        return apis, headers
+
+    def _request(self, apis, headers):
+        """
+        Given ``apis`` and request ``headers`` by API name, request the APIs
+        concurrently in a pool of up to ``workers`` threads. Does not access
+        the data store node and is safe to call from any thread. Unchanged
+        APIs respond with ``_NOT_MODIFIED`` instead of data.
+
+        :param apis: API metadata by API name
+        :type apis: dict
+        :param headers: Request headers by API name
+        :type headers: dict
+        :return: Responses and errors by API name, responses are
+                 (data, meta) tuples, with the response's validators and
+                 content digest as meta
+        :rtype: tuple
+        """
+        def fetch(api_name):
+            return self._request_api(api_name, apis, headers)
+
+        api_names = list(apis)
+        workers = min(self.workers, len(api_names))
+        if workers > 1:
+            pool = ThreadPool(workers)
+            try:
+                results = pool.map(fetch, api_names)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [fetch(api_name) for api_name in api_names]
+        return self._collect(results)
+
+    def _request_api(self, api_name, apis, headers):
+        """
+        Given an ``api_name``, ``apis`` and request ``headers`` by API name,
+        request the API. Safe to call from any thread.
+
+        :return: API name and response, or the error if the request failed
+        :rtype: tuple
+        """
+        try:
+            if self.disk_cache is not None:
+                return api_name, self._request_cached(apis[api_name])
+            data, meta, _ = self._get_response(apis[api_name]['url'],
+                                               headers[api_name],
+                                               _get_spec(apis[api_name]))
+            return api_name, (data, meta)
+        except (NukeDataStoreError, ValueError) as e:
+            return api_name, e
+
+    def _get_response(self, url, headers, spec=None):
+        """
+        Given a ``url``, request ``headers`` and a projection ``spec``,
+        request, decode and shape the response. With ``stream`` enabled, the
+        response is decoded while it is downloaded and errors while
+        downloading raise :class:`~nukedatastore.NukeDataStoreError`.
+        Identical requests from any API cache in this process share a single
+        request and its decoded data, while in flight and for
+        ``COALESCE_WINDOW`` seconds after.
+
+        .. note::
+
+            Coalesced data is shared between callers, don't mutate it.
+
+        :param url: URL
+        :type url: str
+        :param headers: Request headers
+        :type headers: dict
+        :param spec: Spec, see :func:`_get_spec`, default: ``None``
+        :type spec: dict
+        :return: Data, or ``_NOT_MODIFIED``, the response's meta and body,
+                 the body is ``None`` if it was streamed or shaped, or if
+                 the data was shared by another request
+        :rtype: tuple
+        """
+        def fetch():
+            request = self._get_request(url, headers=headers,
+                                        stream=self.stream)
+            try:
+                if request.status_code == 304:
+                    return (_NOT_MODIFIED, None), None
+                if self.stream:
+                    request.raw.decode_content = True
+                    try:
+                        data = _load_stream(request.raw, spec)
+                    except (HTTPError, requests.RequestException) as e:
+                        error = NukeDataStoreError(
+                            'Request failed: {0}'.format(e))
+                        error.response = None
+                        raise error
+                    body = None
+                else:
+                    data = _shape(request.json(), spec)
+                    body = None if spec else request.content
+                return (data, self._get_response_meta(request, data)), body
+            finally:
+                request.close()
+
+        key = (url, tuple(sorted(headers.items())), _canonical(spec))
+        (data, meta), body = _coalesce(key, fetch)
+        return data, meta, body
+
+    def _get_response_meta(self, request, data):
+        """
+        Given a ``request`` and its decoded ``data``, return the response's
+        validators, content digest and the data's canonical encoding, which
+        is stored as is instead of encoding the data again.
+
+        :rtype: dict
+        """
+        encoded = _canonical(data)
+        return {
+            'etag': request.headers.get('ETag'),
+            'last_modified': request.headers.get('Last-Modified'),
+            'digest': hashlib.sha1(encoded.encode('utf-8')).hexdigest(),
+            'encoded': encoded
+        }
+
+    def _request_cached(self, meta):
+        """
+        Given an API's ``meta``, request the API through the disk cache.
+        Fresh cached responses are served without a request, stale ones are
+        revalidated with the disk cache's validators. Responses missing from
+        the disk cache, or evicted while being read, are requested without
+        validators, so their body can be stored. If the API is unreachable
+        or fails with a server error, the cached response is served in
+        ``offline`` mode.
+
+        :param meta: API metadata
+        :type meta: dict
+        :return: Response data and meta
+        :rtype: tuple
+        """
+        disk_cache = self.disk_cache
+        url = meta['url']
+        spec = _get_spec(meta)
+        key = url
+        if spec:
+            key = '{0}#spec={1}'.format(url, _canonical(spec))
+        entry = disk_cache.get(key)
+        if entry is not None and disk_cache.fresh(entry):
+            cached = self._read_cached(entry, meta)
+            if cached is not None:
+                return cached
+            entry = None
+        if entry is None:
+            data, response_meta, body = self._get_response(url, {}, spec)
+            disk_cache.put(key, body or response_meta['encoded'].encode(
+                'utf-8'), response_meta)
+            return data, response_meta
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            data, response_meta, body = self._get_response(url, headers,
+                                                           spec)
+        except NukeDataStoreError as e:
+            if disk_cache.offline and (e.response is None or
+                                       e.response.status_code >= 500):
+                cached = self._read_cached(entry, meta)
+                if cached is not None:
+                    return cached
+            raise
+        if data is _NOT_MODIFIED:
+            disk_cache.touch(key)
+            cached = self._read_cached(entry, meta)
+            if cached is not None:
+                return cached
+            data, response_meta, body = self._get_response(url, {}, spec)
+        disk_cache.put(key, body or response_meta['encoded'].encode('utf-8'),
+                       response_meta)
+        return data, response_meta
+
+    def _read_cached(self, entry, meta):
+        """
+        Given a disk cache ``entry`` and an API's ``meta``, return the cached
+        response, or ``_NOT_MODIFIED`` if the API already holds it. Return
+        ``None`` if the response was evicted in the meantime.
+
+        :return: Response data and meta
+        :rtype: tuple
+        """
+        response_meta = {'etag': entry['etag'],
+                         'last_modified': entry['last_modified'],
+                         'digest': entry['digest']}
+        if meta['timestamp'] is not None and \
+                meta.get('digest') == entry['digest']:
+            return _NOT_MODIFIED, response_meta
+        try:
+            return self.disk_cache.read(entry), response_meta
+        except (IOError, OSError):
+            return None
+
+    def _collect(self, results):
+        """
+        Given a list of ``results`` of API requests, split them into
+        responses and errors.
+
+        :param results: (api_name, response or error) tuples
+        :type results: list
+        :return: Responses and errors by API name
+        :rtype: tuple
+        """
+        responses = {}
+        errors = {}
+        for api_name, response in results:
+            if isinstance(response, Exception):
+                errors[api_name] = str(response)
+            else:
+                responses[api_name] = response
+        return responses, errors
+
+    def _request_async(self, apis, headers, callback):
+        """
+        Given ``apis``, request ``headers`` by API name and a ``callback``,
+        request the APIs on the shared background thread pool and call
+        ``callback`` with the responses and errors on Nuke's main thread.
+        Returns immediately.
+
+        :param apis: API metadata by API name
+        :type apis: dict
+        :param headers: Request headers by API name
+        :type headers: dict
+        :param callback: Callback, called with responses and errors
+        :type callback: callable
+        """
+        api_names = list(apis)
+        results = []
+        lock = threading.Lock()
+
+        def fetch(api_name):
+            try:
+                return self._request_api(api_name, apis, headers)
+            except Exception as e:
+                return api_name, e
+
+        def collect(result):
+            with lock:
+                results.append(result)
+                if len(results) < len(api_names):
+                    return
+            nuke.executeInMainThread(callback, args=self._collect(results))
+
+        if not api_names:
+            nuke.executeInMainThread(callback, args=({}, {}))
+        engine = _get_engine()
+        for api_name in api_names:
+            engine.apply_async(fetch, (api_name,), callback=collect)
+
+    def _fetch(self, api_names):
+        """
+        Given a list of ``api_names``, fetch the APIs concurrently.
+
+        :param api_names: API names
+        :type api_names: list
+        :return: API metadata, responses and errors by API name
+        :rtype: tuple
+        """
+        apis, headers = self._prepare(api_names)
+        responses, errors = self._request(apis, headers)
+        return apis, responses, errors
+
+    def diff(self, *args, **kwargs):
         """
         Given \*args, diff specified APIs, if no APIs are specified, diff
-        all registered APIs.
+        all registered APIs. APIs are requested concurrently, raise
+        :class:`~nukedatastore.NukeDataStoreError` after all APIs were
+        diff'ed if any API failed.
 
         :param \*args: API names
         :type \*args: str
+        :param raise_errors: Raise if any API failed, default: ``True``
+        :type raise_errors: bool
         :return: Diff
-        :rtype: dict
+        :rtype: :class:`~nukedatastore.NukeAPIResult`
         """
         if not args:
             args = self.list()
-        diff = {}
-        for api_name in args:
-            api = self._get_api(api_name)
-            url = api[0]
-            content = api[2]
-            try:
-                request = self._get_request(url)
-            except NukeDataStoreError:
-                raise NukeDataStoreError('Diff\'ing {0} failed'.format(
-                    api_name))
-            diff[api_name] = deepdiff.DeepDiff(content, request.json())
+        diff = self._diff_responses(*self._fetch(args))
+        if kwargs.get('raise_errors', True):
+            diff.raise_errors('Diff\'ing {0} failed')
+        return diff
+
+    def _get_shaped(self, apis, api_name):
+        """
+        Given ``apis`` and an ``api_name``, return the API's cached data
+        projected to its fields. Cached data was already filtered when it
+        was stored, so the API's ``where`` filter is not applied again.
+
+        :return: API data
+        """
+        return _project(self._get_item(api_name),
+                        _get_field_tree(apis[api_name].get('fields')))
+
+    def _diff_responses(self, apis, responses, errors):
+        """
+        Given ``apis``, ``responses`` and ``errors`` by API name, diff the
+        responses against the cached data.
+
+        :return: Diff
+        :rtype: :class:`~nukedatastore.NukeAPIResult`
+        """
+        diff = NukeAPIResult()
+        diff.errors = errors
+        for api_name, (data, meta) in responses.items():
+            if self._unchanged(apis, api_name, data, meta):
+                diff[api_name] = {}
+            else:
+                diff[api_name] = _diff(self._get_shaped(apis, api_name),
+                                       data)
         return diff
 
-    def update(self, *args):
+    def _run_async(self, args, operation, message, raise_errors):
+        """
+        Given ``args``, an ``operation`` applying fetched responses, an error
+        ``message`` and whether to ``raise_errors``, request the APIs in the
+        background and run ``operation`` on Nuke's main thread.
+
+        :return: Future
+        :rtype: :class:`~nukedatastore.NukeAPIFuture`
+        """
+        if not args:
+            args = self.list()
+        apis, headers = self._prepare(args)
+        future = NukeAPIFuture()
+
+        def complete(responses, errors):
+            try:
+                result = operation(apis, responses, errors)
+                if raise_errors:
+                    result.raise_errors(message)
+            except Exception as e:
+                future._complete(exception=e)
+            else:
+                future._complete(result)
+
+        self._request_async(apis, headers, complete)
+        return future
+
+    def diff_async(self, *args, **kwargs):
+        """
+        Given \*args, diff specified APIs like
+        :meth:`~nukedatastore.NukeAPICache.diff` without blocking. APIs are
+        requested on a background thread pool shared by all API caches.
+
+        Usage:
+
+        >>> future = api_cache.diff_async('project_data')
+        >>> future.add_done_callback(lambda future: print(future.result()))
+
+        :param \*args: API names
+        :type \*args: str
+        :param raise_errors: Raise if any API failed, default: ``True``
+        :type raise_errors: bool
+        :return: Future of the diff
+        :rtype: :class:`~nukedatastore.NukeAPIFuture`
+        """
+        return self._run_async(args, self._diff_responses,
+                               'Diff\'ing {0} failed',
+                               kwargs.get('raise_errors', True))
+
+    def update(self, *args, **kwargs):
         """
         Given \*args, update specified APIs, if no APIs are specified, update
-        all registered APIs.
+        all registered APIs. APIs are requested concurrently, successful
+        updates are applied even if other APIs failed. Raise
+        :class:`~nukedatastore.NukeDataStoreError` after all APIs were
+        updated if any API failed. APIs that did not change on the server
+        only record the time they were checked, their data is left untouched.
 
         :param \*args: API names
         :type \*args: str
+        :param raise_errors: Raise if any API failed, default: ``True``
+        :type raise_errors: bool
+        :return: Update timestamps
+        :rtype: :class:`~nukedatastore.NukeAPIResult`
         """
         self._check_frozen()
         if not args:
             args = self.list()
-        for api_name in args:
-            api = self._get_api(api_name)
-            url = api[0]
-            content = api[2]
-            try:
-                request = self._get_request(url)
-            except NukeDataStoreError:
-                raise NukeDataStoreError('Updating {0} failed'.format(
-                    api_name))
-            self._set_item(api_name, [url,
-                                      datetime.datetime.utcnow().isoformat(),
-                                      request.json()])
+        result = self._apply(*self._fetch(args))
+        if kwargs.get('raise_errors', True):
+            result.raise_errors('Updating {0} failed')
+        return result
+
+    def update_async(self, *args, **kwargs):
+        """
+        Given \*args, update specified APIs like
+        :meth:`~nukedatastore.NukeAPICache.update` without blocking. APIs are
+        requested on a background thread pool shared by all API caches, the
+        responses are applied on Nuke's main thread.
+
+        :param \*args: API names
+        :type \*args: str
+        :param raise_errors: Raise if any API failed, default: ``True``
+        :type raise_errors: bool
+        :return: Future of the update timestamps
+        :rtype: :class:`~nukedatastore.NukeAPIFuture`
+        """
+        self._check_frozen()
+
+        def apply(apis, responses, errors):
+            self._check_frozen()
+            return self._apply(apis, responses, errors)
+
+        return self._run_async(args, apply, 'Updating {0} failed',
+                               kwargs.get('raise_errors', True))
+
+    def _unchanged(self, apis, api_name, data, meta):
+        """
+        Given ``apis``, an ``api_name`` and its fetched ``data`` and
+        ``meta``, return whether the API is unchanged on the server, by
+        comparing content digests. APIs cached before digests were recorded
+        are digested from their cached data.
+
+        :rtype: bool
+        """
+        if data is _NOT_MODIFIED:
+            return True
+        digest = self._get_meta(api_name).get('digest')
+        if digest is None:
+            digest = _digest(self._get_item(api_name))
+        return meta['digest'] == digest
+
+    def changed(self, *args, **kwargs):
+        """
+        Given \*args, return whether specified APIs changed on the server,
+        if no APIs are specified, check all registered APIs. Compare content
+        digests of the server's and the cached data.
+
+        :param \*args: API names
+        :type \*args: str
+        :param raise_errors: Raise if any API failed, default: ``True``
+        :type raise_errors: bool
+        :return: Whether APIs changed
+        :rtype: :class:`~nukedatastore.NukeAPIResult`
+        """
+        if not args:
+            args = self.list()
+        apis, responses, errors = self._fetch(args)
+        result = NukeAPIResult()
+        result.errors = errors
+        for api_name, (data, meta) in responses.items():
+            result[api_name] = not self._unchanged(apis, api_name, data, meta)
+        if kwargs.get('raise_errors', True):
+            result.raise_errors('Checking {0} failed')
+        return result
+
+    def digests(self, *args):
+        """
+        Given \*args, return content digests for specified APIs, if no APIs
+        are specified, return digests for all registered APIs. APIs without
+        data or cached before digests were recorded have no digest.
+
+        :param \*args: API names
+        :type \*args: str
+        :return: Digests by API name
+        :rtype: dict
+        """
+        if not args:
+            args = self.list()
+        return dict((api_name, self._get_meta(api_name).get('digest'))
+                    for api_name in args)
+
+    def refresh(self, *args, **kwargs):
+        """
+        Given \*args, refresh specified APIs, if no APIs are specified,
+        refresh all registered APIs. Each API is requested once, diff'ed
+        against the cached data and updated from the same response. APIs
+        without changes keep their data, and their digests, ETags and
+        Last-Modified dates unless the server confirmed them. In
+        ``interactive`` mode, ask before updating each changed API.
+
+        :param \*args: API names
+        :type \*args: str
+        :param interactive: Ask before updating, default: ``False``
+        :type interactive: bool
+        :param raise_errors: Raise if any API failed, default: ``True``
+        :type raise_errors: bool
+        :return: Update timestamps of the refreshed APIs
+        :rtype: :class:`~nukedatastore.NukeAPIResult`
+        """
+        self._check_frozen()
+        if not args:
+            args = self.list()
+        apis, responses, errors = self._fetch(args)
+        approved = {}
+        for api_name in sorted(responses):
+            data, meta = responses[api_name]
+            if self._unchanged(apis, api_name, data, meta):
+                data = _NOT_MODIFIED
+            else:
+                diff = _diff(self._get_shaped(apis, api_name), data)
+                if not diff:
+                    data, meta = _NOT_MODIFIED, None
+                elif kwargs.get('interactive') and not nuke.ask(
+                        REFRESH_PROMPT.format(api=api_name, diff=diff)):
+                    continue
+            approved[api_name] = (data, meta)
+        result = self._apply(apis, approved, errors)
+        if kwargs.get('raise_errors', True):
+            result.raise_errors('Refreshing {0} failed')
+        return result
+
+    def _apply(self, apis, responses, errors):
+        """
+        Given ``apis``, ``responses`` and ``errors`` by API name, as returned
+        by :meth:`_fetch`, set the new API data and metadata. Data with a
+        canonical encoding in its response meta is stored without encoding
+        it again.
+
+        :param apis: API metadata by API name
+        :type apis: dict
+        :param responses: Responses by API name
+        :type responses: dict
+        :param errors: Errors by API name
+        :type errors: dict
+        :return: Update timestamps
+        :rtype: :class:`~nukedatastore.NukeAPIResult`
+        """
+        result = NukeAPIResult()
+        result.errors = errors
+        timestamp = datetime.datetime.utcnow().isoformat()
+        items = {}
+        metas = {}
+        for api_name, (data, response_meta) in responses.items():
+            meta = dict(self._get_meta(api_name))
+            encoded = None
+            if response_meta:
+                meta.update(response_meta)
+                encoded = meta.pop('encoded', None)
+            if data is _NOT_MODIFIED:
+                result[api_name] = meta['timestamp']
+            else:
+                items[api_name] = [meta['url'], timestamp, data]
+                if encoded is not None:
+                    items[api_name] = _Encoded('[{0}, {1}, {2}]'.format(
+                        json.dumps(meta['url']), json.dumps(timestamp),
+                        encoded))
+                meta['timestamp'] = timestamp
+                result[api_name] = timestamp
+            meta['checked'] = timestamp
+            metas[self._get_meta_attr(api_name)] = meta
+        self._set_items(items)
+        self._set_items(metas, ds_attr=False)
+        return result
+
+    def __getitem__(self, key):
+        self._revalidate(key)
+        return super(NukeAPICache, self).__getitem__(key)
+
+    def get_path(self, key, *path):
+        self._revalidate(key)
+        return super(NukeAPICache, self).get_path(key, *path)
+
+    def _revalidate(self, key):
+        """
+        Given a ``key``, update the API if it is older than its maximum age
+        or refresh it in the background if it is older than its time to
+        live. Frozen API caches are never refreshed.
+
+        :param key: Data store key
+        :type key: str
+        """
+        meta = self._get_meta(key)
+        ttl = meta.get('ttl')
+        max_age = meta.get('max_age')
+        if (ttl is None and max_age is None) or self.is_frozen():
+            return
+        checked = meta.get('checked')
+        if checked:
+            age = datetime.datetime.utcnow() - _parse_timestamp(checked)
+            age = age.days * 86400 + age.seconds + age.microseconds / 1e6
+        else:
+            age = float('inf')
+        if max_age is not None and age > max_age:
+            self.update(key)
+        elif ttl is not None and age > ttl:
+            self._refresh_async(key)
+
+    def _refresh_async(self, key):
+        """
+        Given a ``key``, request the API on a background thread and apply
+        the response on Nuke's main thread. Errors are collected in
+        ``refresh_errors``.
+
+        :param key: Data store key
+        :type key: str
+        """
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        apis, headers = self._prepare([key])
+        self._request_async(apis, headers,
+                            functools.partial(self._apply_refresh, apis))
+
+    def _apply_refresh(self, apis, responses, errors):
+        """
+        Given the results of a background refresh, apply them unless the API
+        cache was frozen in the meantime.
+        """
+        try:
+            if not self.is_frozen():
+                self._apply(apis, responses, errors)
+            for api_name in apis:
+                self.refresh_errors.pop(api_name, None)
+            self.refresh_errors.update(errors)
+        except NukeDataStoreError as e:
+            for api_name in apis:
+                self.refresh_errors[api_name] = str(e)
+        finally:
+            with self._refresh_lock:
+                self._refreshing.difference_update(apis)
 
     def _get_api(self, key):
         """
@@ -476,8 +3315,7 @@ class NukeAPICache(NukeDataStore):
         >>> [url, timestamp, data]
         """
         try:
-            return self._from_json(
-                self.store[self._get_ds_attr(key)].value())
+            return self._read(self._get_ds_attr(key))
         except NameError:
             raise KeyError(key)
 
@@ -493,13 +3331,16 @@ class NukeAPICache(NukeDataStore):
         """
         try:
             if ds_attr:
-                return self._from_json(
-                    self.store[self._get_ds_attr(key)].value())[-1]
+                return self._read(self._get_ds_attr(key))[-1]
             else:
-                return self._from_json(self.store[key].value())
+                return self._read(key)
         except NameError:
             raise KeyError(key)
 
     def __repr__(self):
         return '<NukeAPICache: {0}, APIs: {1}>'.format(self.store.name(),
-                                                       len(self.list()))
+                                                       len(self))
+
+
+if nuke:
+    _install_callbacks()
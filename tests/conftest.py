@@ -1,7 +1,97 @@
 # nukedatastore py.test configuration
+import json
+import time
+import threading
+
 import pytest
+import nukedatastore
 from nukedatastore import NukeDataStore, NukeAPICache
 
+try:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in API. ``/api/<name>`` returns JSON built from the path,
+    ``/api/records?count=<n>`` returns a list of records, ``?delay=<seconds>``
+    delays the response, ``?stall=<seconds>`` stalls halfway through the
+    body, any other path returns 404.
+    Responses carry an ETag of the server's version, matching
+    ``If-None-Match`` requests return 304.
+    """
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        params = dict(param.split('=') for param in query.split('&') if param)
+        self.server.requests.append(self.path)
+        time.sleep(float(params.get('delay', 0)))
+        if not path.startswith('/api/'):
+            self.send_error(404)
+            return
+        etag = '"v{0}"'.format(self.server.version)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        if path == '/api/records':
+            data = [{'id': i, 'name': 'record {0}'.format(i),
+                     'version': self.server.version,
+                     'status': {'code': 'ip', 'progress': 0.5}}
+                    for i in range(int(params.get('count', 3)))]
+        else:
+            data = {'name': path[len('/api/'):],
+                    'version': self.server.version}
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if 'stall' in params:
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            time.sleep(float(params['stall']))
+            body = body[len(body) // 2:]
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class APIServer(ThreadingMixIn, HTTPServer):
+    # let stalled and delayed responses finish before the interpreter exits
+    daemon_threads = False
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), APIRequestHandler)
+        self.requests = []
+        self.version = 1
+
+    def handle_error(self, request, client_address):
+        """
+        Ignore clients that disconnected before a delayed response was sent.
+        """
+        pass
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{0}'.format(self.server_address[1])
+
+
+@pytest.fixture(autouse=True)
+def coalesce_window(monkeypatch):
+    """
+    Only coalesce concurrent requests, tests change API responses between
+    back-to-back requests.
+    """
+    nukedatastore._FLIGHTS.clear()
+    monkeypatch.setattr(nukedatastore, 'COALESCE_WINDOW', 0)
+
 
 @pytest.fixture(scope='session')
 def datastore():
@@ -17,3 +107,14 @@ def api_cache():
 def nuke():
     import nuke
     return nuke
+
+
+@pytest.fixture(scope='session')
+def api_server():
+    server = APIServer()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
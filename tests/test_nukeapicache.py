@@ -1,13 +1,20 @@
 # nukeapi_cache tests
+import os
+import time
 import pytest
 import datetime
+import deepdiff
 
-from nukedatastore import NukeAPICache, NukeDataStoreError
+import nukedatastore
+from nukedatastore import (NukeAPICache, NukeAPIDiskCache, NukeDataStoreError,
+                           create_session, _diff)
 
 
 def test_api_cache_set_invalid(api_cache):
     with pytest.raises(NotImplementedError):
         api_cache['project_data'] = 123
+    with pytest.raises(NotImplementedError):
+        api_cache.set_many({'project_data': 123})
 
 def test_api_cache_register(api_cache):
     api_cache.register('project_data',
@@ -71,3 +78,532 @@ def test_api_cache_diff_invalid(api_cache):
                         update=False)
     with pytest.raises(NukeDataStoreError):
         temp_cache.diff()
+
+
+def test_api_cache_update_concurrent(api_server):
+    temp_cache = NukeAPICache('concurrent_cache', workers=4)
+    for i in range(4):
+        temp_cache.register('api_{0}'.format(i),
+                            '{0}/api/{1}?delay=0.5'.format(api_server.url, i),
+                            update=False)
+    start = time.time()
+    result = temp_cache.update()
+    assert time.time() - start < 1.5
+    assert sorted(result) == ['api_0', 'api_1', 'api_2', 'api_3']
+    assert not result.errors
+    assert temp_cache['api_2'] == {'name': '2', 'version': 1}
+
+
+def test_api_cache_update_errors(api_server):
+    temp_cache = NukeAPICache('errors_cache')
+    temp_cache.register('valid_api', '{0}/api/valid'.format(api_server.url),
+                        update=False)
+    temp_cache.register('invalid_api', '{0}/invalid'.format(api_server.url),
+                        update=False)
+    with pytest.raises(NukeDataStoreError) as e:
+        temp_cache.update()
+    assert list(e.value.result.errors) == ['invalid_api']
+    assert temp_cache['valid_api'] == {'name': 'valid', 'version': 1}
+    result = temp_cache.diff(raise_errors=False)
+    assert list(result) == ['valid_api']
+    assert list(result.errors) == ['invalid_api']
+
+
+def test_api_cache_session(api_cache):
+    assert api_cache.session is NukeAPICache('temp_cache').session
+    session = create_session(pool_size=2)
+    assert NukeAPICache('temp_cache', session=session).session is session
+
+
+def test_api_cache_timeout(api_server):
+    temp_cache = NukeAPICache('timeout_cache', timeout=0.2,
+                              session=create_session(retries=0))
+    temp_cache.register('slow_api',
+                        '{0}/api/slow?delay=1'.format(api_server.url),
+                        update=False)
+    start = time.time()
+    with pytest.raises(NukeDataStoreError):
+        temp_cache.update()
+    assert time.time() - start < 1
+
+
+def test_api_cache_update_not_modified(api_server):
+    temp_cache = NukeAPICache('etag_cache')
+    temp_cache.register('etag_api', '{0}/api/etag'.format(api_server.url))
+    data = temp_cache.store['ds_etag_api'].value()
+    timestamp = temp_cache.timestamp('etag_api')[0][1]
+    temp_cache.update()
+    assert temp_cache.store['ds_etag_api'].value() == data
+    assert temp_cache.timestamp('etag_api')[0][1] == timestamp
+    assert temp_cache.diff() == {'etag_api': {}}
+    api_server.version = 2
+    try:
+        temp_cache.update()
+        assert temp_cache['etag_api'] == {'name': 'etag', 'version': 2}
+        assert temp_cache.timestamp('etag_api')[0][1] > timestamp
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_ttl(api_server):
+    temp_cache = NukeAPICache('ttl_cache')
+    temp_cache.register('ttl_api', '{0}/api/ttl'.format(api_server.url),
+                        ttl=0)
+    timestamp = temp_cache.timestamp('ttl_api')
+    api_server.version = 2
+    try:
+        assert temp_cache['ttl_api'] == {'name': 'ttl', 'version': 1}
+        for _ in range(50):
+            if temp_cache.timestamp('ttl_api') != timestamp:
+                break
+            time.sleep(0.1)
+        assert temp_cache['ttl_api'] == {'name': 'ttl', 'version': 2}
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_max_age(api_server):
+    temp_cache = NukeAPICache('max_age_cache')
+    temp_cache.register('max_age_api',
+                        '{0}/api/max_age'.format(api_server.url),
+                        max_age=0)
+    api_server.version = 2
+    try:
+        assert temp_cache['max_age_api'] == {'name': 'max_age', 'version': 2}
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_diff_changed(api_server):
+    temp_cache = NukeAPICache('diff_cache')
+    temp_cache.register('diff_api', '{0}/api/diff'.format(api_server.url))
+    api_server.version = 2
+    try:
+        assert temp_cache.diff() == {'diff_api': {'values_changed': {
+            "root['version']": {'new_value': 2, 'old_value': 1}}}}
+    finally:
+        api_server.version = 1
+
+
+@pytest.mark.parametrize('old, new', [
+    ({'id': 1, 'name': 'a'}, {'id': 1, 'name': 'a'}),
+    ({'a': 1, 'b': [1, 2]}, {'a': 1.0, 'b': [1, 2, 3], 'c': None}),
+    ([{'id': 1, 'x': 1}, {'id': 2, 'x': 2}],
+     [{'id': 1, 'x': 1}, {'id': 2, 'x': 3}, {'id': 3, 'x': [0]}]),
+    ({'shots': [{'id': 1, 'tags': ['a']}, {'id': 1}]},
+     {'shots': [{'id': 1, 'tags': ['b']}]}),
+    ([1, 2, 3], 'changed')
+])
+def test_api_cache_diff_engine(old, new):
+    assert _diff(old, new) == dict(deepdiff.DeepDiff(old, new))
+
+
+def test_api_cache_diff_engine_records():
+    old = [{'id': 1, 'x': 1}, {'id': 2, 'x': 2}]
+    new = [{'id': 2, 'x': 3}, {'id': 3, 'x': 0}]
+    assert _diff(old, new) == {
+        'iterable_item_removed': {'root[0]': {'id': 1, 'x': 1}},
+        'iterable_item_added': {'root[1]': {'id': 3, 'x': 0}},
+        'values_changed': {"root[0]['x']": {'new_value': 3, 'old_value': 2}}}
+
+
+def test_api_cache_diff_engine_reordered():
+    old = [{'id': 1, 'x': 1}, {'id': 2, 'x': 2}, {'id': 3, 'x': 3}]
+    new = [{'id': 2, 'x': 2}, {'id': 4, 'x': 4}, {'id': 1, 'x': 1}]
+    assert _diff(old, new)
+    assert _diff(old, new) == dict(deepdiff.DeepDiff(old, new))
+
+
+def test_api_cache_update_encoded(api_server):
+    temp_cache = NukeAPICache('encoded_cache')
+    temp_cache.register('encoded_api',
+                        '{0}/api/records'.format(api_server.url))
+    data = temp_cache['encoded_api']
+    assert len(data) == 3
+    raw = temp_cache.store['ds_encoded_api'].value()
+    assert nukedatastore._canonical(data) in raw
+    meta = temp_cache.metadata('encoded_api')
+    assert 'encoded' not in meta
+    assert meta['digest'] == nukedatastore._digest(data)
+
+
+def test_api_cache_refresh(api_server):
+    temp_cache = NukeAPICache('refresh_cache')
+    temp_cache.register('refresh_api',
+                        '{0}/api/refresh'.format(api_server.url))
+    api_server.version = 2
+    try:
+        requests = len(api_server.requests)
+        result = temp_cache.refresh()
+        assert len(api_server.requests) == requests + 1
+        assert list(result) == ['refresh_api']
+        assert temp_cache['refresh_api'] == {'name': 'refresh', 'version': 2}
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_refresh_interactive(api_server, nuke, monkeypatch):
+    temp_cache = NukeAPICache('refresh_cache')
+    temp_cache.register('refresh_api',
+                        '{0}/api/refresh'.format(api_server.url))
+    api_server.version = 2
+    try:
+        monkeypatch.setattr(nuke, 'ask', lambda message: False)
+        assert not temp_cache.refresh(interactive=True)
+        assert temp_cache['refresh_api'] == {'name': 'refresh', 'version': 1}
+        monkeypatch.setattr(nuke, 'ask', lambda message: True)
+        assert temp_cache.refresh(interactive=True)
+        assert temp_cache['refresh_api'] == {'name': 'refresh', 'version': 2}
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_refresh_equivalent(api_server, monkeypatch):
+    temp_cache = NukeAPICache('refresh_cache')
+    temp_cache.register('equivalent_api',
+                        '{0}/api/equivalent'.format(api_server.url))
+    meta = temp_cache.metadata('equivalent_api')
+    api_server.version = 2
+    try:
+        monkeypatch.setattr(nukedatastore, '_diff', lambda old, new: {})
+        assert temp_cache.refresh('equivalent_api') == {
+            'equivalent_api': meta['timestamp']}
+        assert temp_cache['equivalent_api'] == {'name': 'equivalent',
+                                                'version': 1}
+        refreshed = temp_cache.metadata('equivalent_api')
+        for key in ('digest', 'etag', 'last_modified', 'timestamp'):
+            assert refreshed[key] == meta[key]
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_digests(api_server):
+    temp_cache = NukeAPICache('digest_cache')
+    temp_cache.register('digest_api', '{0}/api/digest'.format(api_server.url))
+    temp_cache.register('unused_api', '{0}/api/unused'.format(api_server.url),
+                        update=False)
+    digests = temp_cache.digests()
+    assert len(digests['digest_api']) == 40
+    assert digests['unused_api'] is None
+    assert temp_cache.changed('digest_api') == {'digest_api': False}
+    api_server.version = 2
+    try:
+        assert temp_cache.changed('digest_api') == {'digest_api': True}
+        temp_cache.update('digest_api')
+        assert (temp_cache.digests('digest_api')['digest_api'] !=
+                digests['digest_api'])
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_metadata(api_server):
+    temp_cache = NukeAPICache('metadata_cache')
+    url = '{0}/api/metadata'.format(api_server.url)
+    temp_cache.register('metadata_api', url)
+    assert temp_cache.metadata('metadata_api')['url'] == url
+    temp_cache.store['ds_metadata_api'].setValue('invalid')
+    assert temp_cache.timestamp('metadata_api')[0][1]
+
+
+def test_api_cache_metadata_legacy(nuke):
+    temp_cache = NukeAPICache('metadata_cache')
+    knob = nuke.Text_Knob('ds_legacy_api', 'ds_legacy_api')
+    knob.setValue('["http://legacy", "2018-01-01T00:00:00", {"id": 1}]')
+    temp_cache.store.addKnob(knob)
+    assert temp_cache.timestamp('legacy_api') == [('legacy_api',
+                                                   '2018-01-01T00:00:00')]
+    assert temp_cache.get_path('legacy_api', 'id') == 1
+
+
+def test_api_cache_delete(api_server):
+    temp_cache = NukeAPICache('delete_cache')
+    temp_cache.register('delete_api', '{0}/api/delete'.format(api_server.url))
+    del temp_cache['delete_api']
+    assert 'delete_api' not in temp_cache
+    assert 'nds_meta_delete_api' not in temp_cache.store.knobs()
+
+
+def test_api_cache_update_async(api_server):
+    temp_cache = NukeAPICache('async_cache')
+    for i in range(4):
+        temp_cache.register('api_{0}'.format(i),
+                            '{0}/api/{1}?delay=0.5'.format(api_server.url, i),
+                            update=False)
+    done = []
+    start = time.time()
+    future = temp_cache.update_async()
+    future.add_done_callback(done.append)
+    assert time.time() - start < 0.5
+    assert not future.done()
+    result = future.result(timeout=5)
+    assert time.time() - start < 1.5
+    assert sorted(result) == ['api_0', 'api_1', 'api_2', 'api_3']
+    assert done == [future]
+    assert temp_cache['api_2'] == {'name': '2', 'version': 1}
+
+
+def test_api_cache_update_async_errors(api_server):
+    temp_cache = NukeAPICache('async_errors_cache')
+    temp_cache.register('invalid_api', '{0}/invalid'.format(api_server.url),
+                        update=False)
+    future = temp_cache.update_async()
+    assert isinstance(future.exception(timeout=5), NukeDataStoreError)
+    assert list(future.exception().result.errors) == ['invalid_api']
+    with pytest.raises(NukeDataStoreError):
+        future.result()
+
+
+def test_api_cache_diff_async(api_server):
+    temp_cache = NukeAPICache('async_diff_cache')
+    temp_cache.register('diff_api', '{0}/api/diff'.format(api_server.url))
+    api_server.version = 2
+    try:
+        diff = temp_cache.diff_async('diff_api').result(timeout=5)
+        assert diff['diff_api'] == {'values_changed': {
+            "root['version']": {'old_value': 1, 'new_value': 2}}}
+        assert temp_cache['diff_api'] == {'name': 'diff', 'version': 1}
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_disk_cache(api_server, tmpdir):
+    disk_cache = NukeAPIDiskCache(str(tmpdir), ttl=60)
+    url = '{0}/api/disk'.format(api_server.url)
+    for name in ('disk_cache_a', 'disk_cache_b'):
+        temp_cache = NukeAPICache(name, disk_cache=disk_cache)
+        temp_cache.register('disk_api', url)
+        assert temp_cache['disk_api'] == {'name': 'disk', 'version': 1}
+    assert api_server.requests.count('/api/disk') == 1
+
+
+def test_api_cache_disk_cache_revalidate(api_server, tmpdir):
+    disk_cache = NukeAPIDiskCache(str(tmpdir))
+    url = '{0}/api/revalidate'.format(api_server.url)
+    NukeAPICache('revalidate_cache_a', disk_cache=str(tmpdir)).register(
+        'revalidate_api', url)
+    temp_cache = NukeAPICache('revalidate_cache_b', disk_cache=disk_cache)
+    temp_cache.register('revalidate_api', url)
+    assert temp_cache['revalidate_api'] == {'name': 'revalidate',
+                                            'version': 1}
+    assert temp_cache.metadata('revalidate_api')['etag'] == '"v1"'
+    assert api_server.requests.count('/api/revalidate') == 2
+
+
+def test_api_cache_disk_cache_warm(api_server, tmpdir):
+    url = '{0}/api/warm'.format(api_server.url)
+    NukeAPICache('warm_cache').register('warm_api', url)
+    disk_cache = NukeAPIDiskCache(str(tmpdir), ttl=600)
+    temp_cache = NukeAPICache('warm_cache', disk_cache=disk_cache)
+    temp_cache.update()
+    assert disk_cache.get(url) is not None
+    temp_cache.update()
+    assert api_server.requests.count('/api/warm') == 2
+
+
+def test_api_cache_disk_cache_evicted(api_server, tmpdir, monkeypatch):
+    url = '{0}/api/evicted'.format(api_server.url)
+    disk_cache = NukeAPIDiskCache(str(tmpdir), ttl=600)
+    NukeAPICache('evicted_cache_a', disk_cache=disk_cache).register(
+        'evicted_api', url)
+    get = disk_cache.get
+
+    def get_evicted(key):
+        entry = get(key)
+        if entry is not None:
+            os.remove(disk_cache._get_object_path(entry['key']))
+        return entry
+
+    monkeypatch.setattr(disk_cache, 'get', get_evicted)
+    temp_cache = NukeAPICache('evicted_cache_b', disk_cache=disk_cache)
+    temp_cache.register('evicted_api', url)
+    assert temp_cache['evicted_api'] == {'name': 'evicted', 'version': 1}
+    assert api_server.requests.count('/api/evicted') == 2
+
+
+def test_api_cache_disk_cache_offline(tmpdir):
+    disk_cache = NukeAPIDiskCache(str(tmpdir))
+    url = 'http://127.0.0.1:1/api/offline'
+    disk_cache.put(url, b'{"name": "offline"}', {'etag': '"v1"'})
+    temp_cache = NukeAPICache('offline_cache', disk_cache=disk_cache,
+                              session=create_session(retries=0))
+    temp_cache.register('offline_api', url)
+    assert temp_cache['offline_api'] == {'name': 'offline'}
+    disk_cache.offline = False
+    with pytest.raises(NukeDataStoreError):
+        temp_cache.update()
+
+
+def test_api_cache_disk_cache_eviction(tmpdir):
+    disk_cache = NukeAPIDiskCache(str(tmpdir), max_size=20)
+    disk_cache.put('http://old', b'[1, 2, 3]', {})
+    same = disk_cache.put('http://same', b'[1, 2, 3]', {})
+    new = disk_cache.put('http://new', b'[4, 5, 6]', {})
+    assert disk_cache.size() == 18
+    os.utime(disk_cache._get_object_path(new['key']), (0, 0))
+    disk_cache.put('http://newer', b'[7, 8, 9]', {})
+    assert disk_cache.get('http://new') is None
+    assert disk_cache.get('http://old')['key'] == same['key']
+    assert disk_cache.read(disk_cache.get('http://newer')) == [7, 8, 9]
+    assert disk_cache.size() == 18
+    disk_cache.clear()
+    assert disk_cache.size() == 0
+
+
+@pytest.mark.parametrize('ijson', [nukedatastore.ijson, None])
+def test_api_cache_disk_cache_read(tmpdir, monkeypatch, ijson):
+    monkeypatch.setattr(nukedatastore, 'ijson', ijson)
+    disk_cache = NukeAPIDiskCache(str(tmpdir))
+    entry = disk_cache.put('http://read', b' {"a": [1, 0.5, null]}', {})
+    assert disk_cache.read(entry) == {'a': [1, 0.5, None]}
+    assert isinstance(disk_cache.read(entry)['a'][1], float)
+
+
+def test_api_cache_coalesce_concurrent(api_server):
+    temp_cache = NukeAPICache('coalesce_cache')
+    url = '{0}/api/coalesce?delay=0.2'.format(api_server.url)
+    temp_cache.register('coalesce_a', url, update=False)
+    temp_cache.register('coalesce_b', url, update=False)
+    temp_cache.update()
+    assert temp_cache['coalesce_a'] == temp_cache['coalesce_b']
+    assert api_server.requests.count('/api/coalesce?delay=0.2') == 1
+
+
+def test_api_cache_coalesce_window(api_server, monkeypatch):
+    monkeypatch.setattr(nukedatastore, 'COALESCE_WINDOW', 60)
+    url = '{0}/api/window'.format(api_server.url)
+    for name in ('window_cache_a', 'window_cache_b'):
+        NukeAPICache(name).register('window_api', url)
+    assert api_server.requests.count('/api/window') == 1
+    requests = api_server.requests.count('/invalid')
+    for _ in range(2):
+        with pytest.raises(NukeDataStoreError):
+            NukeAPICache('window_cache_a').register(
+                'invalid_api', '{0}/invalid'.format(api_server.url))
+    assert api_server.requests.count('/invalid') == requests + 2
+
+
+def test_api_cache_coalesce_expire(monkeypatch):
+    monkeypatch.setattr(nukedatastore, 'COALESCE_WINDOW', 0.1)
+    assert nukedatastore._coalesce('expire', lambda: ([1], b'[1]')) == (
+        [1], b'[1]')
+    assert nukedatastore._coalesce('expire', lambda: ([2], b'[2]')) == (
+        [1], None)
+    time.sleep(0.3)
+    assert 'expire' not in nukedatastore._FLIGHTS
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_api_cache_fields(api_server, stream):
+    temp_cache = NukeAPICache('fields_cache', stream=stream)
+    temp_cache.register('records_api',
+                        '{0}/api/records'.format(api_server.url),
+                        fields=['id', 'status.code', 'invalid'])
+    assert temp_cache['records_api'] == [
+        {'id': i, 'status': {'code': 'ip'}} for i in range(3)]
+    assert temp_cache.metadata('records_api')['fields'] == [
+        'id', 'status.code', 'invalid']
+
+
+@pytest.mark.parametrize('ijson', [nukedatastore.ijson, None])
+def test_api_cache_stream(api_server, monkeypatch, ijson):
+    monkeypatch.setattr(nukedatastore, 'ijson', ijson)
+    temp_cache = NukeAPICache('stream_cache', stream=True)
+    temp_cache.register('records_api',
+                        '{0}/api/records?count=100'.format(api_server.url))
+    temp_cache.register('name_api', '{0}/api/name'.format(api_server.url))
+    records = temp_cache['records_api']
+    assert len(records) == 100
+    assert records[1] == {'id': 1, 'name': 'record 1', 'version': 1,
+                          'status': {'code': 'ip', 'progress': 0.5}}
+    assert isinstance(records[1]['status']['progress'], float)
+    assert temp_cache['name_api'] == {'name': 'name', 'version': 1}
+    assert not temp_cache.changed()['records_api']
+
+
+@pytest.mark.parametrize('ijson', [nukedatastore.ijson, None])
+def test_api_cache_stream_stalled(api_server, monkeypatch, ijson):
+    monkeypatch.setattr(nukedatastore, 'ijson', ijson)
+    temp_cache = NukeAPICache('stream_cache', stream=True, timeout=0.2,
+                              session=create_session(retries=0))
+    temp_cache.register('stalled_api',
+                        '{0}/api/records?count=100&stall=1'.format(
+                            api_server.url),
+                        update=False)
+    start = time.time()
+    with pytest.raises(NukeDataStoreError):
+        temp_cache.update()
+    assert time.time() - start < 1
+
+
+def test_api_cache_fields_nested():
+    tree = nukedatastore._get_field_tree(['shot', 'shot.name', 'asset.id'])
+    assert tree == {'shot': None, 'asset': {'id': None}}
+    data = {'shot': {'name': 'sh010', 'id': 1}, 'asset': [{'id': 2, 'x': 3}]}
+    assert nukedatastore._project(data, tree) == {
+        'shot': {'name': 'sh010', 'id': 1}, 'asset': [{'id': 2}]}
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_api_cache_where(api_server, stream):
+    temp_cache = NukeAPICache('where_cache', stream=stream)
+    temp_cache.register('records_api',
+                        '{0}/api/records?count=5'.format(api_server.url),
+                        fields=['$[*].id', "$[*]['status'].code"],
+                        where={'id': [1, 3], 'status.code': 'ip'})
+    assert temp_cache['records_api'] == [{'id': 1, 'status': {'code': 'ip'}},
+                                         {'id': 3, 'status': {'code': 'ip'}}]
+    assert temp_cache.metadata('records_api')['fields'] == ['id',
+                                                            'status.code']
+
+
+def test_api_cache_where_invalid(api_server):
+    temp_cache = NukeAPICache('where_cache')
+    with pytest.raises(NukeDataStoreError):
+        temp_cache.register('records_api',
+                            '{0}/api/records'.format(api_server.url),
+                            where=['id'])
+
+
+def test_api_cache_diff_projected(api_server):
+    temp_cache = NukeAPICache('projected_cache')
+    url = '{0}/api/records'.format(api_server.url)
+    temp_cache.register('ids_api', url, fields=['id'])
+    temp_cache.register('versions_api', url, fields=['id', 'version'])
+    api_server.version = 2
+    try:
+        diff = temp_cache.diff()
+        assert diff['ids_api'] == {}
+        assert sorted(diff['versions_api']['values_changed']) == [
+            "root[{0}]['version']".format(i) for i in range(3)]
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_diff_filtered(api_server):
+    temp_cache = NukeAPICache('filtered_cache')
+    temp_cache.register('filtered_api',
+                        '{0}/api/records'.format(api_server.url),
+                        fields=['id', 'version'],
+                        where={'status.code': 'ip'})
+    assert len(temp_cache['filtered_api']) == 3
+    api_server.version = 2
+    try:
+        diff = temp_cache.diff()['filtered_api']
+        assert list(diff) == ['values_changed']
+        assert sorted(diff['values_changed']) == [
+            "root[{0}]['version']".format(i) for i in range(3)]
+        temp_cache.refresh('filtered_api')
+        assert temp_cache['filtered_api'] == [
+            {'id': i, 'version': 2} for i in range(3)]
+    finally:
+        api_server.version = 1
+
+
+def test_api_cache_shape():
+    data = [{'id': 1, 'status': {'code': 'ip'}}, {'id': 2}]
+    spec = {'fields': ['id'], 'where': {'status.code': 'ip'}}
+    assert nukedatastore._shape(data, spec) == [{'id': 1}]
+    assert nukedatastore._shape(nukedatastore._shape(data, spec),
+                                {'fields': ['id'], 'where': None}) == [
+        {'id': 1}]
+    assert nukedatastore._shape(data, None) is data
@@ -2,7 +2,9 @@
 import pytest
 import datetime
 
-from nukedatastore import NukeDataStore, NukeDataStoreError
+import nukedatastore
+from nukedatastore import (NukeDataStore, NukeAPICache, NukeDataStoreError,
+                           stores)
 
 
 def test_datastore_crud(datastore):
@@ -29,6 +31,265 @@ def test_datastore_crud_frozen(datastore):
     datastore.unfreeze()
 
 
+def test_datastore_frozen_external_change(datastore):
+    assert not datastore.is_frozen()
+    datastore.store['nds_frozen'].setValue('true')
+    assert datastore.is_frozen()
+    datastore.unfreeze()
+    assert not datastore.is_frozen()
+
+
+def test_datastore_frozen_without_callback(datastore, monkeypatch):
+    monkeypatch.setattr(nukedatastore, '_invalidate', lambda node, attr: None)
+    assert not datastore.is_frozen()
+    datastore.store['nds_frozen'].setValue('true')
+    assert datastore.is_frozen()
+    datastore.store['nds_frozen'].setValue('false')
+    assert not datastore.is_frozen()
+
+
+def test_datastore_frozen_context(datastore):
+    with datastore.frozen():
+        assert datastore.is_frozen()
+        with pytest.raises(NukeDataStoreError):
+            datastore['project_data'] = {}
+        with datastore.unfrozen():
+            datastore['project_data'] = {'id': 1234, 'name': 'project name'}
+        assert datastore.is_frozen()
+    assert not datastore.is_frozen()
+
+
+def test_datastore_get_path(datastore):
+    datastore['shots'] = {'sq010': {'sh020': {'frames': [1001, 1100]}}}
+    assert datastore.get_path('shots', 'sq010', 'sh020', 'frames', 1) == 1100
+    assert datastore.get_path('shots') == datastore['shots']
+    with pytest.raises(KeyError):
+        datastore.get_path('shots', 'sq010', 'sh030')
+    with pytest.raises(KeyError):
+        datastore.get_path('shots', 'sq010', 'sh020', 'frames', 2)
+
+
+def test_datastore_cache(datastore):
+    datastore['cached_data'] = {'id': 1234}
+    datastore.clear_cache()
+    assert datastore['cached_data'] == {'id': 1234}
+    assert datastore['cached_data'] == {'id': 1234}
+    assert datastore.cache_misses == 1
+    assert datastore.cache_hits == 1
+
+
+def test_datastore_cache_invalidation(datastore):
+    datastore['cached_data'] = {'id': 1234}
+    assert datastore['cached_data'] == {'id': 1234}
+    datastore.store['ds_cached_data'].setValue('{"id": 5678}')
+    assert datastore['cached_data'] == {'id': 5678}
+    datastore['cached_data'] = {'id': 9012}
+    assert datastore['cached_data'] == {'id': 9012}
+
+
+def test_datastore_cache_shared(datastore):
+    datastore['cached_data'] = {'id': 1234, 'tags': ['a']}
+    data = datastore['cached_data']
+    assert datastore['cached_data'] is data
+    assert datastore.get_path('cached_data', 'tags') is data['tags']
+
+
+def test_datastore_cache_disabled(datastore):
+    datastore.clear_cache()
+    datastore.cache_enabled = False
+    datastore['cached_data']
+    datastore['cached_data']
+    assert datastore.cache_hits == 0
+    datastore.cache_enabled = True
+
+
+def test_datastore_set_many(datastore):
+    datastore.set_many({'shot_data': {'id': 1}, 'asset_data': [1, 2, 3]})
+    assert datastore.get_many(['shot_data', 'asset_data']) == {
+        'shot_data': {'id': 1}, 'asset_data': [1, 2, 3]}
+
+
+def test_datastore_set_many_invalid_data(datastore):
+    with pytest.raises(NukeDataStoreError):
+        datastore.set_many({'shot_data': {'id': 2},
+                            'data': datetime.datetime.now()})
+    assert datastore['shot_data'] == {'id': 1}
+
+
+def test_datastore_get_many_invalid_key(datastore):
+    with pytest.raises(KeyError):
+        datastore.get_many(['shot_data', 'invalid_key'])
+
+
+def test_datastore_update(datastore):
+    datastore.update({'shot_data': {'id': 3}}, asset_data=[4])
+    assert datastore['shot_data'] == {'id': 3}
+    assert datastore['asset_data'] == [4]
+
+
+def test_datastore_update_frozen(datastore):
+    datastore.freeze()
+    with pytest.raises(NukeDataStoreError):
+        datastore.update(shot_data={})
+    datastore.unfreeze()
+
+
+def test_datastore_elide_unchanged(datastore):
+    datastore['context'] = {'shot': 'sh010'}
+    writes_elided = datastore.writes_elided
+    datastore['context'] = {'shot': 'sh010'}
+    assert datastore.writes_elided == writes_elided + 1
+    datastore['context'] = {'shot': 'sh020'}
+    assert datastore.writes_elided == writes_elided + 1
+    assert datastore['context'] == {'shot': 'sh020'}
+
+
+def test_datastore_transaction(datastore):
+    with datastore.transaction():
+        datastore['transaction_data'] = 1
+        datastore.set_many({'transaction_data': 2, 'other_data': 3})
+        assert datastore['transaction_data'] == 2
+        assert 'ds_other_data' not in datastore.store.knobs()
+    assert datastore.get_many(['transaction_data', 'other_data']) == {
+        'transaction_data': 2, 'other_data': 3}
+
+
+def test_datastore_transaction_rollback(datastore):
+    with pytest.raises(ValueError):
+        with datastore.transaction():
+            datastore['transaction_data'] = 4
+            datastore['rollback_data'] = 5
+            datastore.freeze()
+            raise ValueError('rollback')
+    assert datastore['transaction_data'] == 2
+    assert 'rollback_data' not in datastore.list()
+    assert not datastore.is_frozen()
+
+
+def test_datastore_transaction_interrupted(datastore):
+    with pytest.raises(KeyboardInterrupt):
+        with datastore.transaction():
+            datastore['interrupted_data'] = 1
+            raise KeyboardInterrupt
+    assert datastore._transaction is None
+    assert 'interrupted_data' not in datastore.list()
+
+
+def test_datastore_index(datastore):
+    datastore['index_data'] = 1
+    assert 'index_data' in datastore
+    assert 'invalid_key' not in datastore
+    assert len(datastore) == len(datastore.list())
+    assert datastore.keys() == datastore.list()
+    assert list(datastore) == datastore.list()
+    assert ('index_data', 1) in datastore.items()
+
+
+def test_datastore_index_rebuild(datastore):
+    keys = datastore.list()
+    datastore.store.removeKnob(datastore.store['nds_index'])
+    datastore.clear_cache()
+    datastore.freeze()
+    assert sorted(datastore.list()) == sorted(keys)
+    assert len(datastore) == len(keys)
+    assert keys[0] in datastore
+    assert 'nds_index' not in datastore.store.knobs()
+    datastore.unfreeze()
+    datastore['rebuild_data'] = 1
+    assert 'nds_index' in datastore.store.knobs()
+    assert sorted(datastore.list()) == sorted(keys + ['rebuild_data'])
+    datastore.store.removeKnob(datastore.store['nds_index'])
+    assert sorted(datastore.rebuild_index()) == sorted(datastore.list())
+    assert 'nds_index' in datastore.store.knobs()
+
+
+def test_datastore_index_contains_unindexed(datastore):
+    datastore.store.addKnob(datastore._create_knob('ds_unindexed_data'))
+    assert 'unindexed_data' in datastore
+    assert 'unindexed_data' not in datastore.list()
+    datastore.store.removeKnob(datastore.store['ds_unindexed_data'])
+    assert 'unindexed_data' not in datastore
+
+
+def test_datastore_index_transaction(datastore):
+    index = datastore.store['nds_index'].value()
+    with datastore.transaction():
+        for i in range(100):
+            datastore['bulk_data_{0}'.format(i)] = i
+        assert 'bulk_data_99' in datastore
+        del datastore['bulk_data_0']
+        assert 'bulk_data_0' not in datastore
+        assert datastore.store['nds_index'].value() == index
+    keys = datastore.list()
+    assert 'bulk_data_0' not in keys
+    assert len([key for key in keys if key.startswith('bulk_data_')]) == 99
+    with datastore.transaction():
+        for key in list(datastore.iter_prefix('bulk_data_')):
+            del datastore[key]
+    assert not list(datastore.iter_prefix('bulk_data_'))
+
+
+def test_datastore_delete(datastore):
+    datastore['delete_data'] = 1
+    del datastore['delete_data']
+    assert 'delete_data' not in datastore
+    assert 'ds_delete_data' not in datastore.store.knobs()
+    with pytest.raises(KeyError):
+        datastore['delete_data']
+    with pytest.raises(KeyError):
+        del datastore['delete_data']
+
+
+def test_datastore_mapping(datastore):
+    datastore['mapping_data'] = 1
+    assert datastore.get('mapping_data') == 1
+    assert datastore.get('invalid_key', 2) == 2
+    assert datastore.setdefault('mapping_default', 3) == 3
+    assert datastore.pop('mapping_data') == 1
+    assert datastore.pop('mapping_default') == 3
+    assert 'mapping_data' not in datastore.list()
+
+
+def test_datastore_delete_transaction(datastore):
+    datastore['transaction_data'] = 1
+    with datastore.transaction():
+        del datastore['transaction_data']
+        assert 'transaction_data' not in datastore
+        assert 'ds_transaction_data' in datastore.store.knobs()
+    assert 'ds_transaction_data' not in datastore.store.knobs()
+
+
+def test_datastore_iter_prefix(datastore):
+    datastore.update(prefix_b=1, prefix_a=2, prefixes=3, asset_prefix=4)
+    assert list(datastore.iter_prefix('prefix_')) == ['prefix_a', 'prefix_b']
+    assert list(datastore.iter_prefix('invalid_')) == []
+
+
+def test_datastore_clear(nuke):
+    ds = NukeDataStore('clear_store', shard_size=16)
+    ds.update(shot_data=list(range(10)), asset_data=1)
+    ds.clear()
+    assert not len(ds)
+    assert not [knob for knob in ds.store.knobs()
+                if knob.startswith(('ds_', 'nds_shard_'))]
+
+
+def test_datastore_compact(nuke):
+    ds = NukeDataStore('compacted_store', shard_size=16)
+    ds['shot_data'] = list(range(10))
+    for attr in ('nds_shard_ds_shot_data_9', 'nds_shard_ds_asset_data_0',
+                 'nds_meta_asset_data'):
+        knob = nuke.Text_Knob(attr, attr)
+        ds.store.addKnob(knob)
+    ds.store.removeKnob(ds.store['ds_shot_data'])
+    assert ds.compact() == ['nds_meta_asset_data',
+                            'nds_shard_ds_asset_data_0',
+                            'nds_shard_ds_shot_data_0',
+                            'nds_shard_ds_shot_data_1',
+                            'nds_shard_ds_shot_data_9']
+    assert ds.list() == []
+
+
 def test_deleted_node(datastore, nuke):
     nuke.delete(nuke.toNode('data_store'))
     with pytest.raises(NukeDataStoreError):
@@ -39,3 +300,92 @@ def test_existing_node_init(nuke):
     NukeDataStore('data_store')
     x = NukeDataStore('data_store')
     assert x
+
+
+def test_renamed_node_init(nuke):
+    ds = NukeDataStore('registry_store')
+    ds['project_data'] = {'id': 1234}
+    ds.store['name'].setValue('renamed_store')
+    x = NukeDataStore('renamed_store')
+    assert x['project_data'] == {'id': 1234}
+
+
+def test_datastore_compression():
+    data = [{'id': i, 'name': 'shot {0}'.format(i)} for i in range(100)]
+    ds = NukeDataStore('compressed_store', compression='zlib',
+                       compression_threshold=0)
+    ds['shot_data'] = data
+    ds['small_data'] = 1
+    assert ds.store['ds_shot_data'].value().startswith('@zlib:')
+    assert ds.store['ds_small_data'].value() == '1'
+    assert NukeDataStore('compressed_store')['shot_data'] == data
+
+
+def test_datastore_compression_invalid():
+    with pytest.raises(NukeDataStoreError):
+        NukeDataStore('compressed_store', compression='invalid')
+
+
+def test_datastore_serializer():
+    ds = NukeDataStore('compact_store', serializer='compact')
+    ds['project_data'] = {'id': 1234, 'name': 'project name'}
+    assert ' ' not in ds.store['ds_project_data'].value().replace(
+        'project name', '')
+    x = NukeDataStore('compact_store')
+    assert x.serializer == 'compact'
+    assert x['project_data'] == {'id': 1234, 'name': 'project name'}
+
+
+def test_datastore_serializer_invalid():
+    with pytest.raises(NukeDataStoreError):
+        NukeDataStore('compact_store', serializer='invalid')
+
+
+def test_datastore_sharding():
+    data = [{'id': i, 'name': 'shot {0}'.format(i)} for i in range(100)]
+    ds = NukeDataStore('sharded_store', shard_size=1024)
+    ds['shot_data'] = data
+    assert ds.store['ds_shot_data'].value().startswith('#shards:')
+    shards = [knob for knob in ds.store.knobs()
+              if knob.startswith('nds_shard_ds_shot_data_')]
+    assert len(shards) > 1
+    assert ds.list() == ['shot_data']
+    assert NukeDataStore('sharded_store', cache=False)['shot_data'] == data
+    ds['shot_data'] = data[:10]
+    assert ds['shot_data'] == data[:10]
+    assert len([knob for knob in ds.store.knobs()
+                if knob.startswith('nds_shard_ds_shot_data_')]) < len(shards)
+    ds['shot_data'] = 1
+    assert ds['shot_data'] == 1
+    assert not [knob for knob in ds.store.knobs()
+                if knob.startswith('nds_shard_')]
+
+
+def test_stores(nuke):
+    ds = NukeDataStore('catalog_store')
+    ds['shot_data'] = {'id': 1}
+    NukeAPICache('catalog_cache')
+    size = sum(len(knob.value()) for attr, knob in ds.store.knobs().items()
+               if attr.startswith(('ds_', 'nds_')))
+    catalog = dict((entry['name'], entry) for entry in stores())
+    assert catalog['catalog_store'] == {'name': 'catalog_store',
+                                        'type': 'data_store', 'keys': 1,
+                                        'size': size, 'frozen': False}
+    assert catalog['catalog_cache']['type'] == 'api_cache'
+    ds.freeze()
+    assert [entry['frozen'] for entry in stores()
+            if entry['name'] == 'catalog_store'] == [True]
+    nuke.delete(ds.store)
+    assert 'catalog_store' not in [entry['name'] for entry in stores()]
+
+
+def test_stores_group(nuke):
+    group = nuke.nodes.Group()
+    group.begin()
+    try:
+        NukeDataStore('nested_store')
+        names = [entry['name'] for entry in stores(refresh=True)]
+    finally:
+        group.end()
+    assert [name for name in names if name.endswith('nested_store')]
+    assert 'data_store' in names